@@ -0,0 +1,29 @@
+"""
+Local market data tools for the TechTreks notebooks.
+
+Modules that need optional dependencies (pyarrow, ...) are imported
+directly, e.g. ``from marketdata.columnar import load_bars``.
+"""
+from .bars import (
+    BAR_COLUMNS,
+    DATA_DIR,
+    PRICE_COLUMNS,
+    STORE_DIR,
+    TIME_COLUMN,
+    find_bar_csvs,
+    read_bar_csv,
+    stack_frames,
+    symbol_from_path,
+)
+
+__all__ = [
+    'BAR_COLUMNS',
+    'DATA_DIR',
+    'PRICE_COLUMNS',
+    'STORE_DIR',
+    'TIME_COLUMN',
+    'find_bar_csvs',
+    'read_bar_csv',
+    'stack_frames',
+    'symbol_from_path',
+]
@@ -0,0 +1,248 @@
+"""
+Cached corporate-action adjustment for the hourly bars.
+
+The hourly *_hourly_ohlcv.csv bars are raw prices, while the yfinance pull
+in QQQ_Historical_DayByDay.csv is dividend- and split-adjusted and lists
+the actions themselves (Dividends, Stock Splits, Capital Gains).
+AdjustmentEngine turns those actions into per-symbol step functions once:
+
+    ex_times        ex-dates as naive-UTC stamps (00:00 exchange time)
+    price_factors   cumulative backward price factor, one entry per interval
+    volume_factors  cumulative backward volume factor (splits only)
+
+computed the way yfinance does it: a cash distribution D with previous
+close C multiplies earlier prices by (1 - D / C); a split of ratio S
+multiplies earlier prices by 1 / S and earlier volume by S.
+
+The factors are built from the full raw history (the engine's `raw`
+mapping), so any later query slice gets the same factors. Adjusting a
+query result is one searchsorted plus a multiply, so the raw
+store is never copied into an adjusted one; AdjustedFrames wraps any
+{symbol: DataFrame} mapping (dict, LazyBarFrames, mmap frames, ...) and
+adjusts each frame as it is read.
+"""
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from .bars import DATA_DIR
+from .sessions import EXCHANGE_TZ
+
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'VWAP']
+VOLUME_FIELDS = ['Volume']
+
+DAYBYDAY_CSV = DATA_DIR / 'QQQ EDA' / 'QQQ_Historical_DayByDay.csv'
+
+
+def actions_from_history(history, split_adjusted=False):
+    """
+    Corporate actions from a time-indexed history with action columns
+    Args:
+        history (DataFrame): Indexed by tz-aware or naive-UTC stamps, with
+            Dividends and Stock Splits (and optionally Capital Gains)
+            columns, e.g. a fetch.py result
+        split_adjusted (bool): The history's prices and volume already
+            reflect its splits (yfinance does this even with
+            auto_adjust=False), so only cash distributions are kept
+    Returns:
+        DataFrame: Indexed by ex-date, with 'cash' (dividends plus capital
+        gains) and 'split' (ratio, 1.0 when none), non-events dropped
+    """
+    times = pd.DatetimeIndex(history.index)
+    if times.tz is None:
+        times = times.tz_localize('UTC')
+    dates = times.tz_convert(EXCHANGE_TZ).tz_localize(None).normalize()
+    cash = history['Dividends'].fillna(0)
+    if 'Capital Gains' in history:
+        cash = cash + history['Capital Gains'].fillna(0)
+    if split_adjusted:
+        split = pd.Series(1.0, index=history.index)
+    else:
+        split = history['Stock Splits'].fillna(0).replace(0, 1.0)
+
+    actions = pd.DataFrame({
+        'cash': cash.to_numpy(),
+        'split': split.to_numpy(),
+    }, index=pd.DatetimeIndex(dates, name='ex_date'))
+    return actions[(actions['cash'] != 0) | (actions['split'] != 1.0)]
+
+
+def read_actions(path=DAYBYDAY_CSV):
+    """
+    Corporate actions from a yfinance history CSV
+    Args:
+        path (str or Path): CSV with Date, Dividends and Stock Splits
+            (and optionally Capital Gains) columns
+    Returns:
+        DataFrame: See actions_from_history()
+    """
+    history = pd.read_csv(path)
+    history.index = pd.DatetimeIndex(pd.to_datetime(history['Date'], utc=True))
+    return actions_from_history(history)
+
+
+def ex_date_stamps(ex_dates):
+    """Naive-UTC stamp of midnight exchange time on each ex-date."""
+    local = pd.DatetimeIndex(ex_dates).tz_localize(EXCHANGE_TZ)
+    return local.tz_convert('UTC').tz_localize(None)
+
+
+def compute_factors(actions, bars):
+    """
+    Cumulative backward adjustment factors for one symbol
+    Args:
+        actions (DataFrame): Output of read_actions()
+        bars (DataFrame): Raw bars indexed by 'Open time' (for the close
+            before each ex-date)
+    Returns:
+        dict: 'ex_times' (int64 ns, ascending), 'price_factors' and
+        'volume_factors' (len(ex_times) + 1 each; entry i applies to bars
+        before ex_times[i] and on/after ex_times[i - 1])
+    """
+    actions = actions.sort_index()
+    ex_times = ex_date_stamps(actions.index).as_unit('ns').asi8
+    closes = bars['Close'].to_numpy(dtype='float64')
+    bar_times = bars.index.as_unit('ns').asi8
+
+    # Close of the last bar before each ex-date
+    before = np.searchsorted(bar_times, ex_times, side='left') - 1
+    prev_close = np.where(before >= 0, closes[np.clip(before, 0, None)], np.nan)
+
+    split = actions['split'].to_numpy(dtype='float64')
+    cash = actions['cash'].to_numpy(dtype='float64')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cash_factor = np.where(np.isfinite(prev_close) & (prev_close > 0),
+                               1.0 - cash / prev_close, 1.0)
+    step_price = cash_factor / split
+    step_volume = split
+
+    # Factor for bars before ex-date i is the product of all steps from i onwards
+    price_factors = np.append(np.cumprod(step_price[::-1])[::-1], 1.0)
+    volume_factors = np.append(np.cumprod(step_volume[::-1])[::-1], 1.0)
+    return {'ex_times': ex_times, 'price_factors': price_factors,
+            'volume_factors': volume_factors}
+
+
+class AdjustmentEngine:
+    """
+    Per-symbol adjustment factors, computed once and applied on demand
+    Factors need the close before every ex-date, so they are always built
+    from the full raw history (`raw`, or the mapping given to prepare()),
+    never from the possibly partial frame being adjusted.
+    Args:
+        actions (dict): {symbol: DataFrame from read_actions()}
+        raw (Mapping): Full-history raw frames, e.g. the dataframes dict or
+            LazyBarFrames (can be given later through prepare())
+    """
+
+    def __init__(self, actions, raw=None):
+        self.actions = dict(actions)
+        self.raw = raw
+        self._factors = {}
+
+    def prepare(self, dataframes):
+        """
+        Use a full-history mapping and compute every symbol's factors now
+        Args:
+            dataframes (Mapping): {symbol: raw DataFrame} with full history
+        Returns:
+            AdjustmentEngine: self
+        """
+        self.raw = dataframes
+        self._factors.clear()
+        for symbol in self.actions:
+            if symbol in dataframes:
+                self.factors(symbol)
+        return self
+
+    def factors(self, symbol):
+        """
+        Cached factor arrays for a symbol (identity if it has no actions)
+        Args:
+            symbol (str): Symbol name
+        Returns:
+            dict: See compute_factors()
+        """
+        if symbol not in self._factors:
+            actions = self.actions.get(symbol)
+            if actions is None or actions.empty:
+                self._factors[symbol] = {'ex_times': np.empty(0, 'int64'),
+                                         'price_factors': np.ones(1),
+                                         'volume_factors': np.ones(1)}
+            else:
+                if self.raw is None or symbol not in self.raw:
+                    raise RuntimeError(f"No full-history bars for {symbol}; pass raw= "
+                                       "or call prepare() before adjusting")
+                self._factors[symbol] = compute_factors(actions, self.raw[symbol])
+        return self._factors[symbol]
+
+    def factor_series(self, symbol, bars):
+        """
+        Price and volume factor for every bar of a frame
+        Args:
+            symbol (str): Symbol name
+            bars (DataFrame): Bars indexed by 'Open time'
+        Returns:
+            DataFrame: 'price' and 'volume' factor columns on bars' index
+        """
+        factors = self.factors(symbol)
+        slot = np.searchsorted(factors['ex_times'], bars.index.as_unit('ns').asi8, side='right')
+        return pd.DataFrame({'price': factors['price_factors'][slot],
+                             'volume': factors['volume_factors'][slot]}, index=bars.index)
+
+    def adjust(self, symbol, bars):
+        """
+        Adjusted version of a raw bar query result
+        Args:
+            symbol (str): Symbol name
+            bars (DataFrame): Raw bars indexed by 'Open time' (any subset of
+                columns or rows)
+        Returns:
+            DataFrame: Same shape, prices and volume adjusted; other
+            columns (Trade count) untouched
+        """
+        if not len(self.factors(symbol)['ex_times']):
+            return bars
+        factor = self.factor_series(symbol, bars)
+        price = factor['price'].to_numpy()
+        volume = factor['volume'].to_numpy()
+
+        adjusted = {}
+        for column in bars.columns:
+            values = bars[column].to_numpy()
+            if column in PRICE_FIELDS:
+                values = values * price
+            elif column in VOLUME_FIELDS:
+                values = values * volume
+            adjusted[column] = values
+        return pd.DataFrame(adjusted, index=bars.index)
+
+
+class AdjustedFrames(Mapping):
+    """
+    Read-through adjusted view over a raw {symbol: DataFrame} mapping
+    The raw mapping stays the single store; frames are adjusted when read.
+    It also serves as the engine's full-history source if it has none yet.
+    Args:
+        raw (Mapping): Raw frames, e.g. the dataframes dict or LazyBarFrames
+        engine (AdjustmentEngine): Factors to apply
+    """
+
+    def __init__(self, raw, engine):
+        self.raw = raw
+        self.engine = engine
+        if engine.raw is None:
+            engine.raw = raw
+
+    def __getitem__(self, symbol):
+        return self.engine.adjust(symbol, self.raw[symbol])
+
+    def __iter__(self):
+        return iter(self.raw)
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __contains__(self, symbol):
+        return symbol in self.raw
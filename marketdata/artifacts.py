@@ -0,0 +1,163 @@
+"""
+Content-addressed, deduplicated pipeline outputs.
+
+The scraper and fetcher notebooks used to write a new *_{timestamp}.csv on
+every run, even when nothing changed. save_artifact() instead stores each
+output once under its SHA-256 and keeps a manifest that maps every logical
+dataset (e.g. 'QQQ_gdelt_news') to its latest version:
+
+    store/artifacts/manifest.json
+    store/artifacts/objects/ab/ab12....csv
+
+If the content matches the latest version, nothing is written. Downstream
+steps resolve "latest" through the manifest (latest_path / load_latest)
+instead of globbing for the newest timestamp, and a stage can record the
+versions of its inputs so it can be skipped when they have not changed:
+
+    inputs = ['QQQ_historical_data', 'QQQ_gdelt_daily_sentiment']
+    if not stage_is_current('QQQ_technical_gdelt_sentiment', inputs):
+        merged = ...
+        save_artifact(merged, 'QQQ_technical_gdelt_sentiment', inputs=inputs)
+"""
+import datetime as dt
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from .bars import STORE_DIR, atomic_write
+
+ARTIFACT_DIR = STORE_DIR / 'artifacts'
+
+
+def _manifest_path(store_dir):
+    return Path(store_dir) / 'manifest.json'
+
+
+def load_manifest(store_dir=ARTIFACT_DIR):
+    """
+    Read the artifact manifest
+    Args:
+        store_dir (str or Path): Artifact store root
+    Returns:
+        dict: {dataset: {'latest': sha256, 'versions': [...]}}
+    """
+    path = _manifest_path(store_dir)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def _save_manifest(manifest, store_dir):
+    with atomic_write(_manifest_path(store_dir), 'w') as f:
+        f.write(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def object_path(sha256, store_dir=ARTIFACT_DIR, suffix='.csv'):
+    """Location of a stored object."""
+    return Path(store_dir) / 'objects' / sha256[:2] / f'{sha256}{suffix}'
+
+
+def artifact_version(dataset, store_dir=ARTIFACT_DIR):
+    """
+    Latest content hash of a dataset
+    Args:
+        dataset (str): Logical dataset name
+        store_dir (str or Path): Artifact store root
+    Returns:
+        str or None: SHA-256 of the latest version, None if never saved
+    """
+    entry = load_manifest(store_dir).get(dataset)
+    return None if entry is None else entry['latest']
+
+
+def save_artifact(df, dataset, index=False, inputs=None, store_dir=ARTIFACT_DIR, verbose=True):
+    """
+    Store a DataFrame by content hash and point the dataset at it
+    Args:
+        df (DataFrame): Output to save (written as CSV)
+        dataset (str): Logical dataset name, e.g. 'QQQ_gdelt_news'
+        index (bool): Include the index, as in DataFrame.to_csv
+        inputs (list): Datasets this output was built from; their current
+            versions are recorded for stage_is_current()
+        store_dir (str or Path): Artifact store root
+        verbose (bool): Print whether anything was written
+    Returns:
+        dict: {'sha256', 'path', 'changed'}
+    """
+    data = df.to_csv(index=index).encode()
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = object_path(sha256, store_dir)
+
+    manifest = load_manifest(store_dir)
+    entry = manifest.setdefault(dataset, {'latest': None, 'versions': []})
+    input_versions = {name: artifact_version(name, store_dir) for name in inputs or []}
+    changed = entry['latest'] != sha256
+
+    if not path.exists():
+        with atomic_write(path) as f:
+            f.write(data)
+
+    if changed:
+        entry['latest'] = sha256
+        entry['versions'].append({
+            'sha256': sha256,
+            'saved_at': dt.datetime.now().isoformat(timespec='seconds'),
+            'rows': len(df),
+        })
+    if changed or entry.get('inputs') != input_versions:
+        entry['inputs'] = input_versions
+        _save_manifest(manifest, store_dir)
+
+    if verbose:
+        state = "saved new version" if changed else "unchanged, nothing written"
+        print(f"{dataset}: {state} ({sha256[:12]})")
+    return {'sha256': sha256, 'path': path, 'changed': changed}
+
+
+def latest_path(dataset, store_dir=ARTIFACT_DIR):
+    """
+    File holding the latest version of a dataset
+    Args:
+        dataset (str): Logical dataset name
+        store_dir (str or Path): Artifact store root
+    Returns:
+        Path: Object file
+    """
+    sha256 = artifact_version(dataset, store_dir)
+    if sha256 is None:
+        raise KeyError(f"No artifact saved for {dataset!r}")
+    return object_path(sha256, store_dir)
+
+
+def load_latest(dataset, store_dir=ARTIFACT_DIR, **read_csv_kwargs):
+    """
+    Read the latest version of a dataset
+    Args:
+        dataset (str): Logical dataset name
+        store_dir (str or Path): Artifact store root
+        **read_csv_kwargs: Passed to pd.read_csv
+    Returns:
+        DataFrame: The stored output
+    """
+    return pd.read_csv(latest_path(dataset, store_dir), **read_csv_kwargs)
+
+
+def stage_is_current(dataset, inputs, store_dir=ARTIFACT_DIR):
+    """
+    Check whether a stage's output was built from the current inputs
+    Args:
+        dataset (str): The stage's output dataset
+        inputs (list): The datasets it reads
+        store_dir (str or Path): Artifact store root
+    Returns:
+        bool: True if the output exists and every input still has the
+        version recorded when it was saved
+    """
+    manifest = load_manifest(store_dir)
+    entry = manifest.get(dataset)
+    if entry is None or entry.get('latest') is None:
+        return False
+    current = {name: (manifest.get(name) or {}).get('latest') for name in inputs}
+    return entry.get('inputs') == current and None not in current.values()
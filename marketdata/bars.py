@@ -0,0 +1,143 @@
+"""
+Shared helpers for the *_hourly_ohlcv.csv bar files.
+
+These mirror the loading loop in notebooks/ImportCSVData.ipynb so every
+storage backend in this package starts from the same DataFrame layout:
+one frame per symbol, indexed by 'Open time', with the columns below.
+"""
+import io
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+# Repository root - the hourly CSVs live here and under 'QQQ EDA/'
+DATA_DIR = Path(__file__).resolve().parent.parent
+
+# Derived stores (parquet, mmap, snapshots, ...) are written below this folder
+STORE_DIR = DATA_DIR / 'store'
+
+CSV_SUFFIX = '_hourly_ohlcv'
+TIME_COLUMN = 'Open time'
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'VWAP']
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Trade count', 'VWAP']
+
+
+def symbol_from_path(path):
+    """
+    Extract the symbol name from a bar file path
+    Args:
+        path (str or Path): e.g. 'SPY_hourly_ohlcv.csv'
+    Returns:
+        str: Symbol name, e.g. 'SPY'
+    """
+    return Path(path).stem.replace(CSV_SUFFIX, '')
+
+
+def find_bar_csvs(data_dir=DATA_DIR, symbols=None):
+    """
+    Locate the hourly bar CSVs below a data directory
+    Args:
+        data_dir (str or Path): Folder to search (recursively)
+        symbols (list): Optional list of symbols to keep
+    Returns:
+        dict: {symbol: Path} in the order of symbols (sorted if None)
+    """
+    found = {}
+    csv_files = Path(data_dir).glob(f'**/*{CSV_SUFFIX}.csv')
+    for csv_file in sorted(csv_files, key=lambda p: (len(p.parts), p)):
+        symbol = symbol_from_path(csv_file)
+        # Shallowest match wins so a root-level file shadows copies in subfolders
+        found.setdefault(symbol, csv_file)
+
+    if symbols is None:
+        return dict(sorted(found.items()))
+
+    missing = [s for s in symbols if s not in found]
+    if missing:
+        raise FileNotFoundError(f"No {CSV_SUFFIX}.csv file for: {missing}")
+    return {s: found[s] for s in symbols}
+
+
+def index_bars(df):
+    """
+    Parse the 'Open time' column of freshly read bars and index on it
+    Args:
+        df (DataFrame): Bars with an 'Open time' text column
+    Returns:
+        DataFrame: Bars indexed by 'Open time'
+    """
+    df[TIME_COLUMN] = pd.to_datetime(df[TIME_COLUMN], format=TIME_FORMAT)
+    return df.set_index(TIME_COLUMN)
+
+
+def read_bar_csv(path):
+    """
+    Read one bar CSV the same way ImportCSVData.ipynb does
+    Args:
+        path (str or Path): Path to a *_hourly_ohlcv.csv file
+    Returns:
+        DataFrame: Bars indexed by 'Open time'
+    """
+    return index_bars(pd.read_csv(path))
+
+
+def read_bar_span(data, columns):
+    """
+    Read a headerless byte span of a bar CSV (whole lines only)
+    Args:
+        data (bytes): CSV lines cut from the middle or end of a file
+        columns (list): Column names from the file's header
+    Returns:
+        DataFrame: Bars indexed by 'Open time' (empty if data is blank)
+    """
+    if data.strip():
+        df = pd.read_csv(io.BytesIO(data), names=columns, header=None)
+    else:
+        df = pd.DataFrame(columns=columns)
+    return index_bars(df)
+
+
+@contextmanager
+def atomic_write(path, mode='wb'):
+    """
+    Open a temporary file that replaces path only once fully written
+    Readers never see a half-written file, and a failed write leaves the
+    old one in place.
+    Args:
+        path (str or Path): Destination (its folder is created)
+        mode (str): 'wb' or 'w'
+    Yields:
+        file: The open temporary file
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Per-process name so concurrent writers do not share a temporary file
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp, mode, newline=None if 'b' in mode else '') as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def stack_frames(dataframes):
+    """
+    Stack {symbol: DataFrame} into one frame with a 'symbol' column
+    Args:
+        dataframes (dict): Frames indexed by 'Open time'
+    Returns:
+        DataFrame: Columns symbol, 'Open time' and the bar columns, with
+        every symbol's rows in their original order
+    """
+    parts = []
+    for symbol, df in dataframes.items():
+        part = df.reset_index()
+        part.insert(0, 'symbol', symbol)
+        parts.append(part)
+    if not parts:
+        return pd.DataFrame(columns=['symbol', TIME_COLUMN] + BAR_COLUMNS)
+    return pd.concat(parts, ignore_index=True)
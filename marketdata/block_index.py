@@ -0,0 +1,181 @@
+"""
+Timestamp block index for range queries over the bar CSVs.
+
+build_block_index() scans a *_hourly_ohlcv.csv once and records, for every
+block of `block_rows` rows, the first 'Open time' and the byte offset where
+the block starts. The index is saved as a sidecar .npz under store/index/.
+
+read_range() binary-searches that index and parses only the byte span of
+the blocks overlapping [start, end], so pulling one month of SPY touches a
+few KB of the file instead of all of it. A sidecar is rebuilt
+automatically when its CSV's size or mtime no longer match.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .bars import DATA_DIR, STORE_DIR, TIME_FORMAT, find_bar_csvs, read_bar_span
+
+INDEX_DIR = STORE_DIR / 'index'
+
+
+def index_path(symbol, index_dir=INDEX_DIR):
+    """Sidecar index file for a symbol."""
+    return Path(index_dir) / f'{symbol}.idx.npz'
+
+
+def build_block_index(csv_file, block_rows=256):
+    """
+    Scan a bar CSV and index the start of every row block
+    Args:
+        csv_file (str or Path): Path to a *_hourly_ohlcv.csv file
+        block_rows (int): Rows per block; smaller blocks mean finer reads
+    Returns:
+        dict: Arrays 'block_times' (int64 ns) and 'block_offsets' (int64
+        bytes) plus 'header', 'rows', 'size', 'mtime_ns' and 'block_rows'
+    """
+    stat = os.stat(csv_file)
+    with open(csv_file, 'rb') as f:
+        data = f.read()
+
+    raw = np.frombuffer(data, dtype=np.uint8)
+    line_ends = np.flatnonzero(raw == ord('\n'))
+    # Row i starts right after newline i (newline 0 ends the header)
+    row_starts = line_ends[:-1] + 1 if len(line_ends) else np.empty(0, dtype=np.int64)
+    if len(line_ends) and line_ends[-1] + 1 < len(data):
+        # Last row without a trailing newline
+        row_starts = np.append(row_starts, line_ends[-1] + 1)
+
+    block_offsets = row_starts[::block_rows].astype(np.int64)
+    stamp_width = len(pd.Timestamp(0).strftime(TIME_FORMAT))
+    stamps = [data[offset:offset + stamp_width].decode() for offset in block_offsets]
+    block_times = pd.to_datetime(pd.Series(stamps, dtype=object), format=TIME_FORMAT)
+
+    return {
+        'block_times': block_times.to_numpy(dtype='datetime64[ns]').view('int64'),
+        'block_offsets': block_offsets,
+        'header': data[:line_ends[0]].decode().strip() if len(line_ends) else data.decode(),
+        'rows': len(row_starts),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'block_rows': block_rows,
+    }
+
+
+def write_block_index(symbol, csv_file, index_dir=INDEX_DIR, block_rows=256):
+    """
+    Build and save the sidecar index for one symbol
+    Args:
+        symbol (str): Symbol name
+        csv_file (str or Path): Path to its bar CSV
+        index_dir (str or Path): Folder for the .idx.npz sidecars
+        block_rows (int): Rows per block
+    Returns:
+        dict: The index that was written
+    """
+    index = build_block_index(csv_file, block_rows)
+    path = index_path(symbol, index_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path, **index)
+    return index
+
+
+def build_all_indexes(data_dir=DATA_DIR, index_dir=INDEX_DIR, symbols=None, block_rows=256):
+    """
+    Build sidecar indexes for every bar CSV
+    Args:
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        index_dir (str or Path): Folder for the .idx.npz sidecars
+        symbols (list): Optional subset of symbols
+        block_rows (int): Rows per block
+    Returns:
+        dict: {symbol: number of blocks}
+    """
+    blocks = {}
+    for symbol, csv_file in find_bar_csvs(data_dir, symbols).items():
+        index = write_block_index(symbol, csv_file, index_dir, block_rows)
+        blocks[symbol] = len(index['block_offsets'])
+    return blocks
+
+
+def load_block_index(symbol, csv_file, index_dir=INDEX_DIR, block_rows=256):
+    """
+    Load a symbol's sidecar, rebuilding it if missing or stale
+    Args:
+        symbol (str): Symbol name
+        csv_file (str or Path): Path to its bar CSV
+        index_dir (str or Path): Folder for the .idx.npz sidecars
+        block_rows (int): Rows per block when a rebuild is needed
+    Returns:
+        dict: The block index
+    """
+    path = index_path(symbol, index_dir)
+    if path.exists():
+        with np.load(path) as saved:
+            index = {key: saved[key] for key in saved.files}
+        stat = os.stat(csv_file)
+        if int(index['size']) == stat.st_size and int(index['mtime_ns']) == stat.st_mtime_ns:
+            index['header'] = str(index['header'])
+            return index
+    return write_block_index(symbol, csv_file, index_dir, block_rows)
+
+
+def block_span(index, start=None, end=None):
+    """
+    Byte span of the blocks that can hold rows in [start, end]
+    Args:
+        index (dict): A block index
+        start: Inclusive lower bound on 'Open time'
+        end: Inclusive upper bound on 'Open time'
+    Returns:
+        tuple: (first byte, end byte or None for end of file)
+    """
+    times = index['block_times']
+    offsets = index['block_offsets']
+    first = 0
+    if start is not None:
+        start_ns = pd.Timestamp(start).as_unit('ns').value
+        first = max(int(np.searchsorted(times, start_ns, side='right')) - 1, 0)
+    last = len(times) - 1
+    if end is not None:
+        end_ns = pd.Timestamp(end).as_unit('ns').value
+        last = int(np.searchsorted(times, end_ns, side='right')) - 1
+        if last < first:
+            return None
+    stop = int(offsets[last + 1]) if last + 1 < len(offsets) else None
+    return int(offsets[first]), stop
+
+
+def read_range(symbol, start=None, end=None, data_dir=DATA_DIR, index_dir=INDEX_DIR):
+    """
+    Read one symbol's bars between two timestamps using its block index
+    Args:
+        symbol (str): Symbol name, e.g. 'SPY'
+        start: Inclusive lower bound on 'Open time'
+        end: Inclusive upper bound on 'Open time'
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        index_dir (str or Path): Folder for the .idx.npz sidecars
+    Returns:
+        DataFrame: Bars indexed by 'Open time'
+    """
+    csv_file = find_bar_csvs(data_dir, [symbol])[symbol]
+    index = load_block_index(symbol, csv_file, index_dir)
+    columns = index['header'].split(',')
+
+    span = block_span(index, start, end) if len(index['block_offsets']) else None
+    if span is None:
+        chunk = b''
+    else:
+        with open(csv_file, 'rb') as f:
+            f.seek(span[0])
+            chunk = f.read() if span[1] is None else f.read(span[1] - span[0])
+
+    df = read_bar_span(chunk, columns)
+
+    if start is not None:
+        df = df[df.index >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df.index <= pd.Timestamp(end)]
+    return df
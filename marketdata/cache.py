@@ -0,0 +1,214 @@
+"""
+Persistent response cache for remote API calls (GDELT, yfinance).
+
+Re-running QQQ_GDELT_News_Scraper.ipynb or ETF_Data_Fetcher.ipynb used to
+send the same queries again, rate-limit sleeps included. ResponseCache
+keeps every response on local disk, keyed on the source name plus a
+normalized form of the request parameters (sorted JSON, so argument order
+and types like Timestamp vs str do not matter):
+
+    store/http_cache/<source>/<sha256>.pkl
+
+Each source has its own time-to-live (SOURCE_TTLS; GDELT results for a
+past window barely change, prices refresh more often). Expired entries are
+dropped when read, and once the cache grows beyond max_size_mb the least
+recently used entries are evicted.
+
+    cache = ResponseCache()
+    articles = cached_article_search(gd, filters, cache)
+    if not cache.last_hit:
+        time.sleep(2)      # only rate-limit real requests
+
+fetch.py wraps its yfinance transport with cached_transport() by default.
+"""
+import hashlib
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+
+from .bars import STORE_DIR, atomic_write
+
+CACHE_DIR = STORE_DIR / 'http_cache'
+
+# Seconds a response stays fresh, per source
+SOURCE_TTLS = {
+    'gdelt': 24 * 3600,
+    'yfinance': 3600,
+    'default': 3600,
+}
+
+
+def normalize_params(params):
+    """
+    Canonical JSON text of request parameters
+    Args:
+        params (dict or list): Request parameters (nested values allowed)
+    Returns:
+        str: Sorted-key JSON, non-JSON values (dates, ...) as strings
+    """
+    return json.dumps(params, sort_keys=True, default=str, separators=(',', ':'))
+
+
+def cache_key(source, params):
+    """SHA-256 key of a (source, params) request."""
+    return hashlib.sha256(f'{source}\n{normalize_params(params)}'.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    On-disk response cache with per-source TTLs and an LRU size bound
+    Args:
+        cache_dir (str or Path): Cache folder
+        ttls (dict): {source: seconds}, merged over SOURCE_TTLS
+        max_size_mb (float): Evict least recently used entries beyond this
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, ttls=None, max_size_mb=512):
+        self.cache_dir = Path(cache_dir)
+        self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+        self.max_bytes = max_size_mb * 1024**2
+        self.hits = 0
+        self.misses = 0
+        self.last_hit = False
+
+    def _path(self, source, params):
+        return self.cache_dir / source / f'{cache_key(source, params)}.pkl'
+
+    def ttl(self, source):
+        """Time-to-live of a source in seconds."""
+        return self.ttls.get(source, self.ttls['default'])
+
+    def get(self, source, params, default=None):
+        """
+        Cached response, if present and still fresh
+        Args:
+            source (str): Source name, e.g. 'gdelt'
+            params (dict): Request parameters
+            default: Returned on a miss
+        Returns:
+            The cached response or default
+        """
+        path = self._path(source, params)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return default
+        if time.time() - entry['created'] > self.ttl(source):
+            path.unlink(missing_ok=True)
+            return default
+        # Access time drives LRU eviction
+        os.utime(path)
+        return entry['value']
+
+    def set(self, source, params, value):
+        """
+        Store a response
+        Args:
+            source (str): Source name
+            params (dict): Request parameters
+            value: Picklable response
+        """
+        with atomic_write(self._path(source, params)) as f:
+            pickle.dump({'created': time.time(), 'source': source,
+                         'params': normalize_params(params), 'value': value}, f, protocol=5)
+        self.evict()
+
+    def get_or_call(self, source, params, func):
+        """
+        Cached response, or func() stored under (source, params)
+        Args:
+            source (str): Source name
+            params (dict): Request parameters identifying func's result
+            func (callable): No-argument function doing the real request
+        Returns:
+            The response; last_hit tells whether it came from the cache
+        """
+        missing = object()
+        value = self.get(source, params, missing)
+        self.last_hit = value is not missing
+        if self.last_hit:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = func()
+        self.set(source, params, value)
+        return value
+
+    @property
+    def size_bytes(self):
+        """Combined size of every cached response."""
+        return sum(path.stat().st_size for path in self.cache_dir.glob('*/*.pkl'))
+
+    def evict(self):
+        """
+        Drop least recently used entries until the cache fits max_size_mb
+        The most recently used entry is always kept, even if it alone is over.
+        Returns:
+            int: Entries removed
+        """
+        files = [(path.stat(), path) for path in self.cache_dir.glob('*/*.pkl')]
+        total = sum(stat.st_size for stat, _ in files)
+        removed = 0
+        for stat, path in sorted(files, key=lambda item: item[0].st_mtime)[:-1]:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            removed += 1
+        return removed
+
+    def clear(self, source=None):
+        """Delete every entry (of one source, if given)."""
+        pattern = '*/*.pkl' if source is None else f'{source}/*.pkl'
+        for path in self.cache_dir.glob(pattern):
+            path.unlink(missing_ok=True)
+
+    def __repr__(self):
+        return (f"ResponseCache({str(self.cache_dir)!r}, {self.size_bytes / 1024**2:.2f} MB, "
+                f"hits={self.hits}, misses={self.misses})")
+
+
+def cached_transport(transport, source='yfinance', cache=None):
+    """
+    Wrap a fetch.py transport so identical requests are served from disk
+    Args:
+        transport (callable): transport(ticker, interval, start, end, period)
+        source (str): Cache source name (selects the TTL)
+        cache (ResponseCache): Cache to use (a default one if None)
+    Returns:
+        callable: Transport with the same signature
+    """
+    cache = ResponseCache() if cache is None else cache
+
+    def call(ticker, interval, start=None, end=None, period=None):
+        params = {'ticker': ticker, 'interval': interval, 'start': start,
+                  'end': end, 'period': period}
+        return cache.get_or_call(source, params,
+                                 lambda: transport(ticker, interval, start=start, end=end, period=period))
+
+    call.cache = cache
+    return call
+
+
+def article_search_params(filters):
+    """Cache parameters of a gdeltdoc article search."""
+    return {'mode': 'artlist', 'query': getattr(filters, 'query_params', None) or repr(filters)}
+
+
+def cached_article_search(gd, filters, cache=None, source='gdelt'):
+    """
+    GdeltDoc.article_search() through the response cache
+    Args:
+        gd (GdeltDoc): gdeltdoc client
+        filters (Filters): gdeltdoc filters (keyed on their query parameters)
+        cache (ResponseCache): Cache to use (a default one if None)
+        source (str): Cache source name (selects the TTL)
+    Returns:
+        DataFrame: Articles, as returned by article_search()
+    """
+    cache = ResponseCache() if cache is None else cache
+    return cache.get_or_call(source, article_search_params(filters),
+                             lambda: gd.article_search(filters))
@@ -0,0 +1,249 @@
+"""
+Dataset catalog with per-file statistics for pruning.
+
+build_catalog() scans every CSV in the repository once and records its
+schema, row count, min/max timestamp, symbol, logical dataset name,
+version timestamp and content fingerprint in store/catalog.json. Files
+whose size/mtime/hash are unchanged keep their previous entry, so
+rebuilding the catalog only opens new or modified files.
+
+Loaders and queries can then pick files from the catalog alone:
+
+    catalog = build_catalog()
+    prune(catalog, symbol='QQQ', start='2025-09-01')   # latest, non-empty
+    prune(catalog, dataset='QQQ_gdelt_news')
+
+File names ending in _YYYYMMDD_HHMMSS (what the scraper and fetcher
+notebooks used to write) are grouped into one logical dataset per prefix;
+only the newest non-empty version of each is kept unless
+latest_only=False. The notebooks now save through artifacts.py, so the
+latest version of every dataset in the artifact manifest is catalogued
+too (artifact=True) and always wins over timestamped files of the same
+dataset. Timestamps are normalized to naive UTC.
+"""
+import json
+import re
+from pathlib import Path
+
+import pandas as pd
+from pandas.errors import EmptyDataError
+
+from .artifacts import ARTIFACT_DIR, latest_path, load_manifest
+from .bars import DATA_DIR, STORE_DIR, TIME_COLUMN
+from .snapshot import fingerprint, is_unchanged
+
+CATALOG_PATH = STORE_DIR / 'catalog.json'
+
+# Columns tried, in order, as a file's timestamp column
+TIME_CANDIDATES = [TIME_COLUMN, 'Date', 'date', 'seendate']
+
+_VERSION_PATTERN = re.compile(r'^(?P<dataset>.+)_(?P<version>\d{8}_\d{6})$')
+_SYMBOL_PATTERN = re.compile(r'^[A-Z]{1,5}$')
+
+
+def parse_name(path):
+    """
+    Split a file name into logical dataset, version and symbol
+    Args:
+        path (str or Path): e.g. 'QQQ EDA/QQQ_gdelt_news_20251110_194823.csv'
+    Returns:
+        dict: {'dataset': 'QQQ_gdelt_news', 'version': '2025-11-10 19:48:23',
+        'symbol': 'QQQ'}; version is None for unversioned files
+    """
+    stem = Path(path).stem
+    match = _VERSION_PATTERN.match(stem)
+    if match:
+        dataset = match['dataset']
+        version = str(pd.to_datetime(match['version'], format='%Y%m%d_%H%M%S'))
+    else:
+        dataset, version = stem, None
+    prefix = dataset.split('_')[0]
+    symbol = prefix if _SYMBOL_PATTERN.match(prefix) else None
+    return {'dataset': dataset, 'version': version, 'symbol': symbol}
+
+
+def describe_file(path, root=DATA_DIR):
+    """
+    Read one CSV and compute its catalog entry
+    Args:
+        path (str or Path): CSV file
+        root (str or Path): Paths in the entry are stored relative to this
+    Returns:
+        dict: Catalog entry
+    """
+    path, root = Path(path), Path(root)
+    entry = {'path': (path.relative_to(root) if root in path.parents else path).as_posix(),
+             'artifact': False}
+    entry.update(parse_name(path))
+    entry.update(fingerprint(path))
+
+    try:
+        df = pd.read_csv(path)
+    except EmptyDataError:
+        df = pd.DataFrame()
+
+    entry['rows'] = len(df)
+    entry['empty'] = len(df) == 0
+    entry['schema'] = {column: str(dtype) for column, dtype in df.dtypes.items()}
+    entry['time_column'] = None
+    entry['min_time'] = None
+    entry['max_time'] = None
+
+    for column in TIME_CANDIDATES:
+        if column in df.columns:
+            times = pd.to_datetime(df[column], utc=True, format='mixed', errors='coerce')
+            times = times.dropna().dt.tz_localize(None)
+            if len(times):
+                entry['time_column'] = column
+                entry['min_time'] = str(times.min())
+                entry['max_time'] = str(times.max())
+            break
+    return entry
+
+
+def describe_artifact(dataset, artifact_dir=ARTIFACT_DIR, root=DATA_DIR):
+    """
+    Catalog entry of the latest version of a manifest dataset
+    Args:
+        dataset (str): Logical dataset name, e.g. 'QQQ_gdelt_news'
+        artifact_dir (str or Path): Artifact store root
+        root (str or Path): Paths in the entry are stored relative to this
+    Returns:
+        dict: Catalog entry with artifact=True
+    """
+    entry = describe_file(latest_path(dataset, artifact_dir), root)
+    saved_at = load_manifest(artifact_dir)[dataset]['versions'][-1]['saved_at']
+    entry.update(parse_name(dataset), version=str(pd.Timestamp(saved_at)), artifact=True)
+    return entry
+
+
+def load_catalog(catalog_path=CATALOG_PATH):
+    """
+    Read the saved catalog
+    Args:
+        catalog_path (str or Path): Catalog JSON file
+    Returns:
+        list: Catalog entries (empty if there is no catalog yet)
+    """
+    catalog_path = Path(catalog_path)
+    if not catalog_path.exists():
+        return []
+    return json.loads(catalog_path.read_text())
+
+
+def build_catalog(data_dir=DATA_DIR, catalog_path=CATALOG_PATH, artifact_dir=ARTIFACT_DIR,
+                  verbose=True):
+    """
+    Scan the CSVs below data_dir and refresh the catalog
+    Args:
+        data_dir (str or Path): Folder to scan recursively (store/ is skipped)
+        catalog_path (str or Path): Catalog JSON file to read and rewrite
+        artifact_dir (str or Path): Artifact store whose latest versions are
+            added (None skips them)
+        verbose (bool): Print how many files were (re)scanned
+    Returns:
+        DataFrame: One row per file
+    """
+    # Absolute, so artifact paths outside data_dir do not end up relative
+    # to the working directory (sql.connect() reads them from data_dir)
+    data_dir = Path(data_dir).resolve()
+    artifact_dir = None if artifact_dir is None else Path(artifact_dir).resolve()
+    previous = {entry['path']: entry for entry in load_catalog(catalog_path)}
+
+    entries = []
+    scanned = 0
+    for path in sorted(data_dir.glob('**/*.csv')):
+        if STORE_DIR in path.parents:
+            continue
+        relative = path.relative_to(data_dir).as_posix()
+        saved = previous.get(relative)
+        if saved is not None and is_unchanged(path, saved):
+            entry = dict(saved, mtime_ns=path.stat().st_mtime_ns)
+        else:
+            entry = describe_file(path, data_dir)
+            scanned += 1
+        entries.append(entry)
+
+    manifest = {} if artifact_dir is None else load_manifest(artifact_dir)
+    for dataset in sorted(manifest):
+        path = latest_path(dataset, artifact_dir)
+        relative = (path.relative_to(data_dir) if data_dir in path.parents else path).as_posix()
+        saved = previous.get(relative)
+        if saved is not None and saved.get('artifact') and saved['dataset'] == dataset \
+                and is_unchanged(path, saved):
+            entry = dict(saved, mtime_ns=path.stat().st_mtime_ns)
+        else:
+            entry = describe_artifact(dataset, artifact_dir, data_dir)
+            scanned += 1
+        entries.append(entry)
+
+    catalog_path = Path(catalog_path)
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    catalog_path.write_text(json.dumps(entries, indent=2))
+    if verbose:
+        print(f"Catalog: {len(entries)} files ({scanned} scanned, "
+              f"{len(entries) - scanned} unchanged)")
+    return catalog_frame(entries)
+
+
+def catalog_frame(entries):
+    """
+    Turn catalog entries into a DataFrame with parsed timestamps
+    Args:
+        entries (list): Entries from load_catalog() or build_catalog()
+    Returns:
+        DataFrame: One row per file
+    """
+    catalog = pd.DataFrame(entries)
+    if catalog.empty:
+        return catalog
+    for column in ['version', 'min_time', 'max_time']:
+        catalog[column] = pd.to_datetime(catalog[column])
+    return catalog
+
+
+def latest_versions(catalog):
+    """
+    Keep the newest non-empty file of every logical dataset
+    The manifest's latest artifact of a dataset beats any timestamped file.
+    Args:
+        catalog (DataFrame): Output of build_catalog() / catalog_frame()
+    Returns:
+        DataFrame: Empty files and superseded versions removed
+    """
+    catalog = catalog[~catalog['empty']]
+    if 'artifact' not in catalog:
+        catalog = catalog.assign(artifact=False)
+    # Unversioned files sort first, so a versioned file wins if both exist,
+    # and artifacts sort after every file
+    ordered = catalog.assign(artifact=catalog['artifact'].fillna(False).astype(bool))
+    ordered = ordered.sort_values(['artifact', 'version'], na_position='first')
+    return ordered.drop_duplicates('dataset', keep='last').sort_values('path')
+
+
+def prune(catalog, symbol=None, dataset=None, start=None, end=None, latest_only=True):
+    """
+    Select files by symbol, dataset and time overlap without opening them
+    Args:
+        catalog (DataFrame): Output of build_catalog() / catalog_frame()
+        symbol (str): Keep files for this symbol
+        dataset (str): Keep files of this logical dataset
+        start: Keep files whose max time is at or after this (naive UTC)
+        end: Keep files whose min time is at or before this (naive UTC)
+        latest_only (bool): Drop empty files and superseded versions
+    Returns:
+        DataFrame: Matching catalog rows
+    """
+    if catalog.empty:
+        return catalog
+    if latest_only:
+        catalog = latest_versions(catalog)
+    if symbol is not None:
+        catalog = catalog[catalog['symbol'] == symbol]
+    if dataset is not None:
+        catalog = catalog[catalog['dataset'] == dataset]
+    if start is not None:
+        catalog = catalog[catalog['max_time'] >= pd.Timestamp(start)]
+    if end is not None:
+        catalog = catalog[catalog['min_time'] <= pd.Timestamp(end)]
+    return catalog
@@ -0,0 +1,189 @@
+"""
+Columnar, compressed bar store partitioned by symbol and year.
+
+convert_csvs_to_parquet() turns the *_hourly_ohlcv.csv files into a hive
+layout (store/parquet/symbol=SPY/year=2023/...parquet) once. load_bars()
+then reads only the requested columns, and uses the symbol/year folders
+plus parquet row-group statistics to skip data outside the time range, so
+nothing is parsed from text on kernel start.
+
+Requires pyarrow (pip install pyarrow).
+"""
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .bars import DATA_DIR, STORE_DIR, TIME_COLUMN, find_bar_csvs, read_bar_csv
+
+PARQUET_DIR = STORE_DIR / 'parquet'
+
+_PARTITIONING = ds.partitioning(
+    pa.schema([('symbol', pa.string()), ('year', pa.int16())]),
+    flavor='hive',
+)
+
+
+def frame_to_table(symbol, df):
+    """
+    Convert a bar DataFrame into an arrow table carrying the partition keys
+    Args:
+        symbol (str): Symbol name
+        df (DataFrame): Bars indexed by 'Open time'
+    Returns:
+        pyarrow.Table: Bars plus 'symbol' and 'year' columns
+    """
+    table = pa.Table.from_pandas(df.reset_index(), preserve_index=False)
+    table = table.append_column('symbol', pa.array([symbol] * len(df), pa.string()))
+    years = pa.array(df.index.year.astype('int16'), pa.int16())
+    return table.append_column('year', years)
+
+
+def write_partitions(tables, store_dir=PARQUET_DIR, compression='zstd', append=False):
+    """
+    Write partition-keyed arrow tables into the hive store
+    Args:
+        tables (list): Tables built with frame_to_table()
+        store_dir (str or Path): Root of the parquet store
+        compression (str): Parquet codec ('zstd', 'snappy', ...)
+        append (bool): Add new files next to the existing ones instead of
+            replacing the symbol/year folders touched by the write
+    """
+    if append:
+        # A unique name per write so appended files never collide
+        basename = f'part-{time.time_ns()}-{{i}}.parquet'
+        behavior = 'overwrite_or_ignore'
+    else:
+        basename = 'part-{i}.parquet'
+        behavior = 'delete_matching'
+
+    ds.write_dataset(
+        pa.concat_tables(tables),
+        Path(store_dir),
+        format='parquet',
+        partitioning=_PARTITIONING,
+        existing_data_behavior=behavior,
+        basename_template=basename,
+        file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+    )
+
+
+def convert_csvs_to_parquet(data_dir=DATA_DIR, store_dir=PARQUET_DIR, symbols=None,
+                            compression='zstd'):
+    """
+    Convert the hourly bar CSVs into the partitioned parquet store
+    Args:
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        store_dir (str or Path): Root of the parquet store
+        symbols (list): Optional subset of symbols to convert
+        compression (str): Parquet codec ('zstd', 'snappy', ...)
+    Returns:
+        dict: {symbol: number of rows written}
+    """
+    tables = []
+    rows = {}
+    for symbol, csv_file in find_bar_csvs(data_dir, symbols).items():
+        df = read_bar_csv(csv_file)
+        tables.append(frame_to_table(symbol, df))
+        rows[symbol] = len(df)
+        print(f"Converted {symbol}: {len(df)} rows")
+
+    if tables:
+        write_partitions(tables, store_dir, compression)
+    return rows
+
+
+def open_dataset(store_dir=PARQUET_DIR):
+    """
+    Open the parquet store as a pyarrow dataset
+    Args:
+        store_dir (str or Path): Root of the parquet store
+    Returns:
+        pyarrow.dataset.Dataset: Dataset with 'symbol' and 'year' partition fields
+    """
+    return ds.dataset(Path(store_dir), format='parquet', partitioning=_PARTITIONING)
+
+
+def last_stored_times(symbols=None, store_dir=PARQUET_DIR):
+    """
+    Latest 'Open time' stored per symbol
+    Args:
+        symbols (list): Symbols to look up (None looks up every symbol)
+        store_dir (str or Path): Root of the parquet store
+    Returns:
+        dict: {symbol: Timestamp}, without symbols that have no rows stored
+    """
+    if not Path(store_dir).exists():
+        return {}
+    table = open_dataset(store_dir).to_table(columns=[TIME_COLUMN, 'symbol'],
+                                             filter=build_filter(symbols))
+    if not len(table):
+        return {}
+    latest = table.group_by('symbol').aggregate([(TIME_COLUMN, 'max')])
+    return {symbol: pd.Timestamp(value) for symbol, value in
+            zip(latest['symbol'].to_pylist(), latest[f'{TIME_COLUMN}_max'].to_pylist())}
+
+
+def build_filter(symbols=None, start=None, end=None):
+    """
+    Build a dataset filter that prunes partitions and row groups
+    Args:
+        symbols (list): Symbols to keep (None keeps all)
+        start: Inclusive lower bound on 'Open time' (anything pd.Timestamp accepts)
+        end: Inclusive upper bound on 'Open time'
+    Returns:
+        pyarrow.dataset.Expression or None
+    """
+    conditions = []
+    if symbols is not None:
+        conditions.append(ds.field('symbol').isin(list(symbols)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        # The year predicate lets the dataset skip whole folders
+        conditions.append(ds.field('year') >= start.year)
+        conditions.append(ds.field(TIME_COLUMN) >= start.to_pydatetime())
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions.append(ds.field('year') <= end.year)
+        conditions.append(ds.field(TIME_COLUMN) <= end.to_pydatetime())
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def load_bars(symbols=None, columns=None, start=None, end=None, store_dir=PARQUET_DIR):
+    """
+    Load bars from the parquet store
+    Args:
+        symbols (list): Symbols to load (None loads every symbol in the store)
+        columns (list): Bar columns to read (None reads all of them)
+        start: Inclusive lower bound on 'Open time'
+        end: Inclusive upper bound on 'Open time'
+        store_dir (str or Path): Root of the parquet store
+    Returns:
+        dict: {symbol: DataFrame indexed by 'Open time'}, same layout as
+        the dataframes dict in ImportCSVData.ipynb
+    """
+    dataset = open_dataset(store_dir)
+    if columns is None:
+        columns = [name for name in dataset.schema.names
+                   if name not in (TIME_COLUMN, 'symbol', 'year')]
+
+    table = dataset.to_table(
+        columns=[TIME_COLUMN, 'symbol'] + list(columns),
+        filter=build_filter(symbols, start, end),
+    )
+    df = table.to_pandas()
+
+    dataframes = {}
+    for symbol, group in df.groupby('symbol', sort=True):
+        group = group.drop(columns='symbol').set_index(TIME_COLUMN).sort_index()
+        dataframes[symbol] = group
+
+    if symbols is not None:
+        dataframes = {s: dataframes[s] for s in symbols if s in dataframes}
+    return dataframes
@@ -0,0 +1,203 @@
+"""
+Concurrent multi-ticker history fetcher with a pluggable transport.
+
+ETF_Data_Fetcher.ipynb used to call yf.Ticker(...).history() by hand for
+one ticker at a time. fetch_histories() takes the whole ticker list,
+downloads with a bounded thread pool (the work is network wait, so threads
+overlap it fine) and normalizes every result into the project bar schema:
+
+    index 'Open time'   naive UTC bar start, like the *_hourly_ohlcv.csv files
+    columns             Open, High, Low, Close, Volume, Trade count, VWAP
+                        (NaN where the source does not provide a field),
+                        then Dividends, Stock Splits, Capital Gains when
+                        the source returns them
+
+yfinance (auto_adjust=False) returns prices and volume already adjusted
+for splits as of the request, but not for dividends; adjust those with
+adjust.py (actions_from_history(..., split_adjusted=True) reads the action
+columns). The hourly bar files and LocalTransport are fully unadjusted. A
+500-ticker pull takes about as long as its slowest few requests.
+
+A transport is any callable
+
+    transport(ticker, interval, start=None, end=None, period=None) -> DataFrame
+
+returning a time-indexed OHLCV frame. yfinance_transport() behind the
+on-disk response cache (see cache.py) is the default; LocalTransport
+serves the local bar CSVs (optionally with an artificial delay), so the
+fetch path can be exercised without network access.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .bars import BAR_COLUMNS, DATA_DIR, PRICE_COLUMNS, TIME_COLUMN, find_bar_csvs, read_bar_csv
+from .cache import cached_transport
+
+# Corporate-action columns kept after the bar columns when a source has them
+ACTION_COLUMNS = ['Dividends', 'Stock Splits', 'Capital Gains']
+
+# Source column names mapped onto the bar schema
+COLUMN_ALIASES = {
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'volume': 'Volume',
+    'trade count': 'Trade count',
+    'trade_count': 'Trade count',
+    'vwap': 'VWAP',
+}
+
+
+def period_start(period, end):
+    """
+    Start of a yfinance-style period ('5d', '1wk', '6mo', '2y', 'max')
+    Args:
+        period (str): Period string
+        end (Timestamp): End of the period
+    Returns:
+        Timestamp or None: Start, None for 'max'
+    """
+    if period == 'max':
+        return None
+    for unit, offset in (('wk', 'weeks'), ('mo', 'months'), ('y', 'years'), ('d', 'days')):
+        if period.endswith(unit):
+            return pd.Timestamp(end) - pd.DateOffset(**{offset: int(period[:-len(unit)])})
+    raise ValueError(f"Unknown period {period!r}")
+
+
+def yfinance_transport(ticker, interval, start=None, end=None, period=None):
+    """
+    Download one ticker's history with yfinance
+    With auto_adjust=False yfinance still adjusts prices and volume for
+    splits (as of the request), but not for dividends. The Dividends /
+    Stock Splits (/ Capital Gains) columns are kept so
+    adjust.actions_from_history(..., split_adjusted=True) can apply the
+    dividends.
+    Args:
+        ticker (str): Ticker symbol
+        interval (str): yfinance interval, e.g. '1h' or '1d'
+        start (str or Timestamp): First date (used when period is None)
+        end (str or Timestamp): End date, exclusive
+        period (str): yfinance period, e.g. '2y'
+    Returns:
+        DataFrame: yfinance history
+    """
+    import yfinance as yf
+
+    kwargs = {'interval': interval, 'auto_adjust': False, 'actions': True}
+    if period is not None:
+        kwargs['period'] = period
+    else:
+        kwargs.update(start=start, end=end)
+    return yf.Ticker(ticker).history(**kwargs)
+
+
+class LocalTransport:
+    """
+    Transport that serves the local *_hourly_ohlcv.csv files
+    Args:
+        data_dir (str or Path): Folder holding the bar CSVs
+        delay (float): Seconds to sleep per request, to mimic network latency
+    """
+
+    def __init__(self, data_dir=DATA_DIR, delay=0.0):
+        self.data_dir = data_dir
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, ticker, interval, start=None, end=None, period=None):
+        self.calls.append((ticker, interval, start, end, period))
+        if self.delay:
+            time.sleep(self.delay)
+        bars = read_bar_csv(find_bar_csvs(self.data_dir, [ticker])[ticker])
+        if period is not None:
+            start = period_start(period, bars.index[-1])
+        lo = 0 if start is None else bars.index.searchsorted(pd.Timestamp(start), side='left')
+        hi = len(bars) if end is None else bars.index.searchsorted(pd.Timestamp(end), side='left')
+        return bars.iloc[lo:hi]
+
+
+def normalize_history(raw):
+    """
+    Convert a transport result to the bar schema
+    Args:
+        raw (DataFrame): Time-indexed OHLCV frame (tz-aware or naive UTC)
+    Returns:
+        DataFrame: Indexed by naive-UTC 'Open time', BAR_COLUMNS in order
+        followed by any ACTION_COLUMNS the source returned
+    """
+    df = raw.rename(columns=lambda name: COLUMN_ALIASES.get(str(name).lower(), name))
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    df = df.set_axis(index.rename(TIME_COLUMN))
+    actions = [column for column in ACTION_COLUMNS if column in df.columns]
+    df = df.reindex(columns=BAR_COLUMNS + actions)
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    return df.astype({column: np.float64 for column in PRICE_COLUMNS})
+
+
+def _fetch_one(transport, ticker, interval, start, end, period, retries, backoff):
+    for attempt in range(retries + 1):
+        began = time.perf_counter()
+        try:
+            raw = transport(ticker, interval, start=start, end=end, period=period)
+            return normalize_history(raw), time.perf_counter() - began
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def fetch_histories(tickers, interval='1d', period=None, start=None, end=None, transport=None,
+                    max_workers=16, retries=2, backoff=1.0, verbose=True):
+    """
+    Download several tickers concurrently and normalize them to bars
+    Args:
+        tickers (list): Ticker symbols
+        interval (str): Bar interval, e.g. '1h' or '1d'
+        period (str): Lookback such as '2y' (instead of start/end)
+        start (str or Timestamp): First date
+        end (str or Timestamp): End date, exclusive
+        transport (callable): See module docstring (cached yfinance_transport
+            if None)
+        max_workers (int): Requests in flight at once
+        retries (int): Extra attempts per ticker after a failure
+        backoff (float): Seconds before the first retry (doubles each time)
+        verbose (bool): Print per-ticker rows and timings
+    Returns:
+        tuple: ({ticker: DataFrame}, {ticker: exception} for tickers that failed)
+    """
+    transport = cached_transport(yfinance_transport) if transport is None else transport
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}, {}
+
+    results = {}
+    errors = {}
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as pool:
+        futures = {
+            pool.submit(_fetch_one, transport, ticker, interval, start, end, period, retries, backoff): ticker
+            for ticker in tickers
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results[ticker], seconds = future.result()
+            except Exception as exc:
+                errors[ticker] = exc
+                if verbose:
+                    print(f"✗ {ticker}: {exc}")
+                continue
+            if verbose:
+                print(f"✓ {ticker}: {len(results[ticker])} rows in {seconds:.2f}s")
+
+    if verbose:
+        print(f"Fetched {len(results)}/{len(tickers)} tickers in {time.perf_counter() - began:.2f}s")
+    # Caller's ticker order rather than completion order
+    return {ticker: results[ticker] for ticker in tickers if ticker in results}, errors
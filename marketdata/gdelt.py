@@ -0,0 +1,292 @@
+"""
+Async GDELT article collector with token-bucket rate limiting.
+
+scrape_qqq_news() in QQQ_GDELT_News_Scraper.ipynb searched its terms one
+after another with time.sleep(2) after each, so wall time grew with every
+term and date window. GdeltCollector issues all queries from one asyncio
+event loop instead:
+
+  * a TokenBucket holds request starts to GDELT's allowance (the DOC API
+    asks for at most one request every 5 seconds, GDELT_RATE), so the
+    collector never waits longer than the limit requires and never trips it
+  * gdeltdoc is synchronous, so each request runs in a worker thread
+    (asyncio.to_thread) and up to max_concurrency are in flight at once
+  * cached responses (see cache.py) are served without taking a token
+  * results are streamed in completion order
+  * date ranges can be sharded into windows (stream(..., shard='7D')), and a
+    window that returns a full page (GDELT_MAX_RECORDS, the most one query
+    can return) is split in half and re-queried until every window is
+    complete, so busy periods are no longer silently undersampled
+
+In a notebook (which already runs an event loop) use await:
+
+    collector = GdeltCollector(cache=ResponseCache())
+    queries = build_queries(SEARCH_TERMS, '2025-01-01', '2025-07-01')
+    async for query, articles in collector.stream(queries):
+        ...
+    news_df = await collector.gather(queries, shard='7D')
+
+and collect() from a plain script.
+"""
+import asyncio
+import time
+
+import pandas as pd
+
+from .cache import article_search_params
+
+# GDELT DOC API allowance: one request every 5 seconds
+GDELT_RATE = 1 / 5
+GDELT_BURST = 1
+
+# Most articles one artlist query returns; a full page means the window was cut off
+GDELT_MAX_RECORDS = 250
+# Smallest window sharding splits down to
+MIN_WINDOW = pd.Timedelta(hours=1)
+
+# Search terms per ticker (the QQQ set is the one the scraper notebook used)
+SEARCH_TERMS = {
+    'QQQ': ['QQQ ETF', 'Invesco QQQ', 'NASDAQ-100 ETF', 'QQQ Trust'],
+}
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, at most `capacity` banked
+    Args:
+        rate (float): Tokens added per second
+        capacity (float): Largest burst
+    """
+
+    def __init__(self, rate=GDELT_RATE, capacity=GDELT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = None
+        self._loop = None
+
+    async def acquire(self):
+        """Wait until a token is available and take it (callers are served FIFO)."""
+        # asyncio.Lock binds to one event loop; each collect() runs a new one
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def build_queries(terms, start_date, end_date):
+    """
+    One query per (ticker, term)
+    Args:
+        terms (dict or list): {ticker: [terms]} or a plain list of terms
+        start_date (str): Start date in format 'YYYY-MM-DD'
+        end_date (str): End date in format 'YYYY-MM-DD'
+    Returns:
+        list: Query dicts with keyword, start_date, end_date and ticker
+    """
+    if not isinstance(terms, dict):
+        terms = {None: terms}
+    return [{'keyword': term, 'start_date': start_date, 'end_date': end_date, 'ticker': ticker}
+            for ticker, ticker_terms in terms.items() for term in ticker_terms]
+
+
+def shard_queries(queries, shard):
+    """
+    Split each query's date range into consecutive windows
+    Args:
+        queries (list): Query dicts
+        shard (str or Timedelta): Window length, e.g. '7D'
+    Returns:
+        list: One query per window (start inclusive, end exclusive)
+    """
+    shard = pd.Timedelta(shard)
+    sharded = []
+    for query in queries:
+        start = pd.Timestamp(query['start_date'])
+        end = pd.Timestamp(query['end_date'])
+        while start < end:
+            stop = min(start + shard, end)
+            sharded.append({**query, 'start_date': start, 'end_date': stop})
+            start = stop
+    return sharded
+
+
+def split_query(query, min_window=MIN_WINDOW):
+    """
+    Halve a query's window (on whole hours, GDELT's useful resolution)
+    Args:
+        query (dict): Query dict
+        min_window (Timedelta): Windows this short are not split
+    Returns:
+        list: Two query dicts, or [] if the window is already minimal
+    """
+    start = pd.Timestamp(query['start_date'])
+    end = pd.Timestamp(query['end_date'])
+    if end - start <= min_window:
+        return []
+    middle = (start + (end - start) / 2).floor('h')
+    if middle <= start:
+        middle = start + min_window
+    return [{**query, 'start_date': start, 'end_date': middle},
+            {**query, 'start_date': middle, 'end_date': end}]
+
+
+def gdelt_filters(query):
+    """gdeltdoc Filters for a query dict (dates as strings or Timestamps)."""
+    from gdeltdoc import Filters
+
+    def as_filter_date(value):
+        return value.to_pydatetime() if isinstance(value, pd.Timestamp) else value
+
+    return Filters(keyword=query['keyword'], start_date=as_filter_date(query['start_date']),
+                   end_date=as_filter_date(query['end_date']), num_records=GDELT_MAX_RECORDS)
+
+
+class GdeltCollector:
+    """
+    Concurrent, rate-limited GDELT article search
+    Args:
+        client: Object with article_search(filters) (gdeltdoc.GdeltDoc if None)
+        cache (ResponseCache): Response cache (None disables caching)
+        rate (float): Requests per second allowed
+        burst (float): Requests that may start back to back
+        max_concurrency (int): Requests in flight at once
+        retries (int): Extra attempts per query after a failure
+        max_records (int): Page size at which a window counts as truncated
+        min_window (Timedelta): Smallest window sharding splits down to
+        make_filters (callable): query dict -> filters for client
+        verbose (bool): Print per-query results
+    """
+
+    def __init__(self, client=None, cache=None, rate=GDELT_RATE, burst=GDELT_BURST,
+                 max_concurrency=4, retries=2, max_records=GDELT_MAX_RECORDS,
+                 min_window=MIN_WINDOW, make_filters=gdelt_filters, verbose=True):
+        if client is None:
+            from gdeltdoc import GdeltDoc
+            client = GdeltDoc()
+        self.client = client
+        self.cache = cache
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.max_records = max_records
+        self.min_window = pd.Timedelta(min_window)
+        self.make_filters = make_filters
+        self.verbose = verbose
+        self.requests = 0
+        self.errors = []
+        self.splits = 0
+        self.truncated = []
+
+    async def search(self, query):
+        """
+        Articles for one query (cache first, then a rate-limited request)
+        Args:
+            query (dict): See build_queries()
+        Returns:
+            DataFrame: Articles with search_term (and ticker) columns added
+        """
+        filters = self.make_filters(query)
+        params = article_search_params(filters)
+        articles = None if self.cache is None else self.cache.get('gdelt', params)
+        if articles is None:
+            for attempt in range(self.retries + 1):
+                await self.bucket.acquire()
+                self.requests += 1
+                try:
+                    articles = await asyncio.to_thread(self.client.article_search, filters)
+                    break
+                except Exception:
+                    if attempt == self.retries:
+                        raise
+            if articles is None:
+                articles = pd.DataFrame()
+            if self.cache is not None:
+                self.cache.set('gdelt', params, articles)
+
+        articles = articles.copy()
+        if len(articles):
+            articles['search_term'] = query['keyword']
+            if query.get('ticker') is not None:
+                articles['ticker'] = query['ticker']
+        return articles
+
+    async def stream(self, queries, shard=None):
+        """
+        Run queries concurrently and yield results as they arrive
+        A window that comes back with max_records articles was truncated by
+        GDELT, so it is split in half and both halves are queried instead,
+        down to min_window. Failed queries are printed and kept in
+        self.errors; windows still full at min_window in self.truncated.
+        Args:
+            queries (list): Query dicts
+            shard (str or Timedelta): Initial window length, e.g. '7D'
+                (None starts from the whole range and only splits when full)
+        Yields:
+            tuple: (query, DataFrame)
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(query):
+            async with semaphore:
+                try:
+                    return query, await self.search(query), None
+                except Exception as exc:
+                    return query, None, exc
+
+        if shard is not None:
+            queries = shard_queries(queries, shard)
+        pending = {asyncio.ensure_future(run(query)) for query in queries}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    query, articles, exc = task.result()
+                    if exc is not None:
+                        self.errors.append((query, exc))
+                        if self.verbose:
+                            print(f"Error searching for '{query['keyword']}': {exc}")
+                        continue
+                    if len(articles) >= self.max_records:
+                        halves = split_query(query, self.min_window)
+                        if halves:
+                            self.splits += 1
+                            pending |= {asyncio.ensure_future(run(half)) for half in halves}
+                            continue
+                        self.truncated.append(query)
+                    if self.verbose:
+                        print(f"Found {len(articles)} articles for '{query['keyword']}' "
+                              f"({query['start_date']} to {query['end_date']})")
+                    yield query, articles
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def gather(self, queries, shard=None):
+        """
+        Every query's articles in one frame, de-duplicated by URL
+        Args:
+            queries (list): Query dicts
+            shard (str or Timedelta): Initial window length (see stream())
+        Returns:
+            DataFrame: Combined articles
+        """
+        frames = [articles async for _, articles in self.stream(queries, shard) if len(articles)]
+        if not frames:
+            return pd.DataFrame()
+        news_df = pd.concat(frames, ignore_index=True)
+        return news_df.drop_duplicates(subset=['url'], keep='first').reset_index(drop=True)
+
+    def collect(self, queries, shard=None):
+        """gather() for code that is not already inside an event loop."""
+        return asyncio.run(self.gather(queries, shard))
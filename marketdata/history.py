@@ -0,0 +1,261 @@
+"""
+Incremental, gap-filling history store for fetched bars.
+
+ETF_Data_Fetcher.ipynb used to download the full two-year window on every
+run. fetch_incremental() keeps fetched bars per interval and symbol
+
+    store/history/<interval>/<SYMBOL>.csv      same layout as the bar CSVs
+    store/history/coverage.json                ranges already fetched
+
+and compares the requested range with the recorded coverage, so only the
+missing segments are requested (through fetch.py's transports). Coverage
+is tracked as requested ranges rather than bar stamps, so weekends and
+holidays are not re-requested forever. Merging is idempotent: rows are
+keyed on 'Open time' and a re-fetched row replaces the stored one.
+
+The newest bar can still be in progress, so coverage of an open-ended
+request stops at the last bar returned; the next refresh fetches that bar
+again and overwrites it. A daily refresh therefore moves a few rows per
+symbol instead of the whole history. yfinance bars are split-adjusted as
+of the request, so when a fetch brings in a new split, the stored bars
+before it are fetched again to keep one scale:
+
+    etf_data, fetched = fetch_incremental(['QQQ', 'SPY'], start='2023-10-01')
+"""
+import datetime as dt
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from .bars import STORE_DIR, TIME_COLUMN, TIME_FORMAT, atomic_write, read_bar_csv
+from .cache import cached_transport
+from .fetch import _fetch_one, yfinance_transport
+
+HISTORY_DIR = STORE_DIR / 'history'
+
+
+def _coverage_path(store_dir):
+    return Path(store_dir) / 'coverage.json'
+
+
+def load_coverage(store_dir=HISTORY_DIR):
+    """
+    Read the fetched ranges
+    Args:
+        store_dir (str or Path): History store root
+    Returns:
+        dict: {interval: {symbol: [[start, end], ...]}} (ISO strings, end exclusive)
+    """
+    path = _coverage_path(store_dir)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_coverage(coverage, store_dir=HISTORY_DIR):
+    """Write the fetched ranges atomically."""
+    with atomic_write(_coverage_path(store_dir), 'w') as f:
+        f.write(json.dumps(coverage, indent=2, sort_keys=True))
+
+
+def merge_ranges(ranges):
+    """
+    Union of half-open [start, end) ranges
+    Args:
+        ranges (list): (start, end) pairs of Timestamps
+    Returns:
+        list: Sorted, non-overlapping (start, end) pairs
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(covered, start, end):
+    """
+    Parts of [start, end) not covered yet
+    Args:
+        covered (list): (start, end) pairs already fetched
+        start (Timestamp): Requested start
+        end (Timestamp): Requested end (exclusive)
+    Returns:
+        list: (start, end) pairs to fetch
+    """
+    gaps = []
+    cursor = start
+    for lo, hi in merge_ranges(covered):
+        if hi <= cursor:
+            continue
+        if lo >= end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, lo))
+        cursor = max(cursor, hi)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def history_path(symbol, interval, store_dir=HISTORY_DIR):
+    """Stored bars of one symbol at one interval."""
+    return Path(store_dir) / interval / f'{symbol}.csv'
+
+
+def read_history(symbol, interval, store_dir=HISTORY_DIR):
+    """
+    Stored bars of one symbol
+    Args:
+        symbol (str): Symbol name
+        interval (str): Bar interval, e.g. '1d'
+        store_dir (str or Path): History store root
+    Returns:
+        DataFrame or None: Bars indexed by 'Open time', None if never fetched
+    """
+    path = history_path(symbol, interval, store_dir)
+    return read_bar_csv(path) if path.exists() else None
+
+
+def merge_history(existing, new):
+    """
+    Idempotent merge of fetched bars into stored ones
+    Args:
+        existing (DataFrame): Stored bars (or None)
+        new (DataFrame): Fetched bars
+    Returns:
+        DataFrame: Union keyed on 'Open time', fetched rows winning
+    """
+    if existing is None or existing.empty:
+        merged = new
+    else:
+        merged = pd.concat([existing, new])
+    merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+    return merged
+
+
+def new_splits(stored, fetched):
+    """
+    Splits in fetched bars that the stored bars before them predate
+    yfinance adjusts prices and volume for splits as of the request, so
+    bars stored before a split took effect are on the old scale.
+    Args:
+        stored (DataFrame): Stored bars (or None)
+        fetched (DataFrame): Newly fetched bars
+    Returns:
+        Series: Split ratio by 'Open time', only splits with stored bars
+        before them that were not already stored with the split
+    """
+    if stored is None or stored.empty or 'Stock Splits' not in fetched:
+        return pd.Series(dtype='float64')
+    splits = fetched['Stock Splits'].fillna(0)
+    splits = splits[(splits != 0) & (splits.index > stored.index[0])]
+    if 'Stock Splits' in stored:
+        known = stored['Stock Splits'].reindex(splits.index).fillna(0)
+        splits = splits[known != splits]
+    return splits
+
+
+def _write_history(df, path):
+    with atomic_write(path, 'w') as f:
+        df.to_csv(f, date_format=TIME_FORMAT, index_label=TIME_COLUMN)
+
+
+def fetch_incremental(tickers, start, end=None, interval='1d', transport=None,
+                      store_dir=HISTORY_DIR, max_workers=16, retries=2, backoff=1.0,
+                      verbose=True):
+    """
+    Fetch only the segments of [start, end) the store does not cover yet
+    Args:
+        tickers (list): Ticker symbols
+        start (str or Timestamp): First bar wanted (naive UTC)
+        end (str or Timestamp): End, exclusive (None means up to now)
+        interval (str): Bar interval, e.g. '1h' or '1d'
+        transport (callable): See fetch.py (cached yfinance_transport if None)
+        store_dir (str or Path): History store root
+        max_workers (int): Requests in flight at once
+        retries (int): Extra attempts per request after a failure
+        backoff (float): Seconds before the first retry (doubles each time)
+        verbose (bool): Print the segments fetched per ticker
+    Returns:
+        tuple: ({ticker: stored bars in [start, end)}, {ticker: rows fetched})
+    """
+    transport = cached_transport(yfinance_transport) if transport is None else transport
+    tickers = list(dict.fromkeys(tickers))
+    now = pd.Timestamp(dt.datetime.now(dt.timezone.utc)).tz_localize(None)
+    start = pd.Timestamp(start)
+    open_ended = end is None or pd.Timestamp(end) > now
+    end = now if open_ended else pd.Timestamp(end)
+
+    coverage = load_coverage(store_dir)
+    covered = coverage.setdefault(interval, {})
+    segments = []
+    for ticker in tickers:
+        ranges = [(pd.Timestamp(lo), pd.Timestamp(hi)) for lo, hi in covered.get(ticker, [])]
+        segments += [(ticker, lo, hi) for lo, hi in missing_ranges(ranges, start, end)]
+
+    fetched = {ticker: [] for ticker in tickers}
+    new_ranges = {ticker: [] for ticker in tickers}
+    began = time.perf_counter()
+    if segments:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(segments))) as pool:
+            futures = {
+                pool.submit(_fetch_one, transport, ticker, interval, lo, hi, None, retries, backoff):
+                    (ticker, lo, hi)
+                for ticker, lo, hi in segments
+            }
+            for future in as_completed(futures):
+                ticker, lo, hi = futures[future]
+                try:
+                    bars, _ = future.result()
+                except Exception as exc:
+                    if verbose:
+                        print(f"✗ {ticker} {lo} -> {hi}: {exc}")
+                    continue
+                fetched[ticker].append(bars)
+                if open_ended and hi == end:
+                    # The newest bar may still be forming; fetch it again next time
+                    hi = bars.index[-1] if len(bars) else lo
+                new_ranges[ticker].append((lo, hi))
+
+    frames = {}
+    rows = {}
+    for ticker in tickers:
+        stored = read_history(ticker, interval, store_dir)
+        splits = new_splits(stored, pd.concat(fetched[ticker])) if fetched[ticker] else ()
+        if len(splits):
+            # Stored bars before a new split are on the old scale: fetch them again
+            lo, hi = stored.index[0], splits.index.max()
+            try:
+                bars, _ = _fetch_one(transport, ticker, interval, lo, hi, None, retries, backoff)
+            except Exception as exc:
+                # Keep the store on one scale; the next refresh tries again
+                fetched[ticker], new_ranges[ticker] = [], []
+                if verbose:
+                    print(f"✗ {ticker} {lo} -> {hi} (re-fetch after split): {exc}")
+            else:
+                stored = stored[stored.index >= hi]
+                fetched[ticker].insert(0, bars)
+                new_ranges[ticker].append((lo, hi))
+        rows[ticker] = sum(len(bars) for bars in fetched[ticker])
+        if fetched[ticker]:
+            stored = merge_history(stored, pd.concat(fetched[ticker]))
+            _write_history(stored, history_path(ticker, interval, store_dir))
+        ranges = [(pd.Timestamp(lo), pd.Timestamp(hi)) for lo, hi in covered.get(ticker, [])]
+        ranges = merge_ranges(ranges + [r for r in new_ranges[ticker] if r[0] < r[1]])
+        covered[ticker] = [[str(lo), str(hi)] for lo, hi in ranges]
+        if stored is not None:
+            frames[ticker] = stored[(stored.index >= start) & (stored.index < end)]
+        if verbose:
+            parts = len([s for s in segments if s[0] == ticker])
+            print(f"{ticker}: {parts} missing segments, {rows[ticker]} rows fetched")
+
+    save_coverage(coverage, store_dir)
+    if verbose:
+        print(f"Refreshed {len(tickers)} tickers in {time.perf_counter() - began:.2f}s")
+    return frames, rows
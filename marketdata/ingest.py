@@ -0,0 +1,213 @@
+"""
+Incremental tail-append ingestion with per-symbol watermarks.
+
+For every symbol the watermark file records the last 'Open time' ingested,
+the byte offset in the CSV just after that row, and a hash of the header
+plus the bytes just before that offset. ingest_tail() seeks straight to
+the offset, parses only the bytes appended since, and pushes
+the new rows into the in-memory dataframes dict and the on-disk stores, so
+a refresh costs O(new rows) instead of O(history). If the hash no longer
+matches, the file was rewritten and is re-read in full instead (filtered
+on the watermark time).
+
+Typical use right after the stores were (re)built from the full CSVs:
+
+    mark_ingested()                      # watermarks = current end of files
+    ...new bars get appended to the CSVs...
+    new_rows = ingest_tail(dataframes=dataframes,
+                           mmap_dir=MMAP_DIR, parquet_dir=PARQUET_DIR)
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from .bars import DATA_DIR, STORE_DIR, atomic_write, find_bar_csvs, read_bar_csv, read_bar_span
+
+WATERMARK_PATH = STORE_DIR / 'watermarks.json'
+
+# Bytes before the watermark offset covered by its hash
+CHECK_BYTES = 4096
+
+
+def load_watermarks(path=WATERMARK_PATH):
+    """
+    Read the watermark file
+    Args:
+        path (str or Path): Watermark JSON file
+    Returns:
+        dict: {symbol: {'last_time': str, 'offset': int, 'check': str}}
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_watermarks(watermarks, path=WATERMARK_PATH):
+    """
+    Write the watermark file atomically
+    Args:
+        watermarks (dict): {symbol: {'last_time': str, 'offset': int, 'check': str}}
+        path (str or Path): Watermark JSON file
+    """
+    with atomic_write(path, 'w') as f:
+        f.write(json.dumps(watermarks, indent=2, sort_keys=True))
+
+
+def _header(csv_file):
+    with open(csv_file, 'rb') as f:
+        return f.readline().decode().strip().split(',')
+
+
+def file_check(csv_file, offset):
+    """
+    Hash identifying the ingested part of a CSV
+    Covers the header line and the CHECK_BYTES bytes before offset, so a
+    rewrite of the file (of any size) changes it.
+    Args:
+        csv_file (str or Path): Path to a bar CSV
+        offset (int): Watermark offset
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(csv_file, 'rb') as f:
+        digest.update(f.readline())
+        start = max(offset - CHECK_BYTES, 0)
+        f.seek(start)
+        digest.update(f.read(offset - start))
+    return digest.hexdigest()
+
+
+def _after(df, last_time):
+    # A watermark taken on a header-only file has no last time
+    return df if last_time is None else df[df.index > pd.Timestamp(last_time)]
+
+
+def read_new_rows(csv_file, watermark=None):
+    """
+    Read the rows appended to a bar CSV since its watermark
+    Only complete lines are consumed; a half-written last line is left for
+    the next call. If the file was rewritten (it shrank, or its header or
+    the bytes before the offset changed), the whole file is re-read and
+    filtered on the watermark time instead.
+    Args:
+        csv_file (str or Path): Path to a *_hourly_ohlcv.csv file
+        watermark (dict): {'last_time': str, 'offset': int, 'check': str} or None
+    Returns:
+        tuple: (DataFrame of new bars indexed by 'Open time', new watermark)
+    """
+    size = os.path.getsize(csv_file)
+    rewritten = watermark is not None and (
+        watermark['offset'] > size
+        or ('check' in watermark
+            and watermark['check'] != file_check(csv_file, watermark['offset'])))
+    if watermark is None or rewritten:
+        df = read_bar_csv(csv_file)
+        if watermark is not None:
+            df = _after(df, watermark['last_time'])
+        offset = size
+    else:
+        with open(csv_file, 'rb') as f:
+            f.seek(watermark['offset'])
+            tail = f.read(size - watermark['offset'])
+        complete = tail[:tail.rfind(b'\n') + 1]
+        offset = watermark['offset'] + len(complete)
+
+        df = read_bar_span(complete, _header(csv_file))
+        # Guard against rows that were rewritten rather than appended
+        df = _after(df, watermark['last_time'])
+
+    if len(df):
+        last_time = df.index[-1]
+    elif watermark is not None:
+        last_time = watermark['last_time']
+    else:
+        last_time = None
+    return df, {'last_time': str(last_time) if last_time is not None else None,
+                'offset': offset, 'check': file_check(csv_file, offset)}
+
+
+def mark_ingested(symbols=None, data_dir=DATA_DIR, watermark_path=WATERMARK_PATH):
+    """
+    Set the watermarks to the current end of each CSV
+    Call this after building the stores from the full files so the next
+    ingest_tail() only picks up rows appended afterwards.
+    Args:
+        symbols (list): Symbols to mark (None marks every bar CSV found)
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        watermark_path (str or Path): Watermark JSON file
+    Returns:
+        dict: The updated watermarks
+    """
+    watermarks = load_watermarks(watermark_path)
+    for symbol, csv_file in find_bar_csvs(data_dir, symbols).items():
+        df = read_bar_csv(csv_file)
+        offset = os.path.getsize(csv_file)
+        watermarks[symbol] = {
+            'last_time': str(df.index[-1]) if len(df) else None,
+            'offset': offset,
+            'check': file_check(csv_file, offset),
+        }
+    save_watermarks(watermarks, watermark_path)
+    return watermarks
+
+
+def ingest_tail(symbols=None, data_dir=DATA_DIR, dataframes=None, mmap_dir=None,
+                parquet_dir=None, watermark_path=WATERMARK_PATH, verbose=True):
+    """
+    Pull the rows appended since the last ingest into memory and the stores
+    A symbol without a watermark is read in full once; rows the mmap or
+    parquet store already holds (at or before its last stored 'Open time')
+    are not appended again.
+    Args:
+        symbols (list): Symbols to refresh (None refreshes every bar CSV found)
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        dataframes (dict): In-memory {symbol: DataFrame} to extend in place
+        mmap_dir (str or Path): mmap store to append to (None skips it)
+        parquet_dir (str or Path): parquet store to append to (None skips it)
+        watermark_path (str or Path): Watermark JSON file
+        verbose (bool): Print the number of new rows per symbol
+    Returns:
+        dict: {symbol: DataFrame of the new rows}
+    """
+    watermarks = load_watermarks(watermark_path)
+    new_rows = {}
+    for symbol, csv_file in find_bar_csvs(data_dir, symbols).items():
+        df, watermarks[symbol] = read_new_rows(csv_file, watermarks.get(symbol))
+        new_rows[symbol] = df
+        if verbose:
+            print(f"{symbol}: {len(df)} new rows")
+
+    fresh = {symbol: df for symbol, df in new_rows.items() if len(df)}
+
+    if dataframes is not None:
+        for symbol, df in fresh.items():
+            current = dataframes.get(symbol)
+            if current is None or not len(current):
+                dataframes[symbol] = df
+            else:
+                dataframes[symbol] = pd.concat([current, df[df.index > current.index.max()]])
+
+    if mmap_dir is not None:
+        from .mmap_store import append_symbol
+        for symbol, df in fresh.items():
+            append_symbol(symbol, df, mmap_dir)
+
+    if parquet_dir is not None and fresh:
+        from .columnar import frame_to_table, last_stored_times, write_partitions
+        # Like append_symbol(): rows the store already holds (e.g. a symbol
+        # read in full for lack of a watermark) are not written twice
+        stored = last_stored_times(list(fresh), parquet_dir)
+        tables = [frame_to_table(symbol, df[df.index > stored[symbol]] if symbol in stored else df)
+                  for symbol, df in fresh.items()]
+        tables = [table for table in tables if len(table)]
+        if tables:
+            write_partitions(tables, parquet_dir, append=True)
+
+    # Watermarks move only after every store accepted the rows
+    save_watermarks(watermarks, watermark_path)
+    return new_rows
@@ -0,0 +1,100 @@
+"""
+Lazy, LRU-bounded replacement for the eager dataframes dict.
+
+LazyBarFrames knows which symbols exist (by globbing for the CSVs) but
+only reads a symbol the first time it is accessed. Loaded frames are kept
+in least-recently-used order and evicted once their combined
+memory_usage(deep=True) goes over the budget, so a notebook that only
+touches dataframes['SPY'] and dataframes['QQQ'] only ever loads those two.
+
+    dataframes = LazyBarFrames(memory_budget_mb=256)
+    spy_data = dataframes['SPY']
+"""
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from .bars import DATA_DIR, find_bar_csvs, read_bar_csv
+
+
+def frame_nbytes(df):
+    """Deep memory footprint of a DataFrame in bytes."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+class LazyBarFrames(Mapping):
+    """
+    Read-only {symbol: DataFrame} mapping that loads on first access
+    Args:
+        symbols (list): Symbols to expose (None exposes every bar CSV found)
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        memory_budget_mb (float): Evict least recently used frames once the
+            loaded frames exceed this size (None never evicts). The most
+            recently accessed frame is always kept, even if it alone is over.
+        reader (callable): path -> DataFrame, e.g. schema.read_bars_typed
+    """
+
+    def __init__(self, symbols=None, data_dir=DATA_DIR, memory_budget_mb=None,
+                 reader=read_bar_csv):
+        self._paths = find_bar_csvs(data_dir, symbols)
+        self._reader = reader
+        self.memory_budget = None if memory_budget_mb is None else memory_budget_mb * 1024**2
+        self._frames = OrderedDict()
+        self._sizes = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def __getitem__(self, symbol):
+        if symbol in self._frames:
+            self._frames.move_to_end(symbol)
+            return self._frames[symbol]
+        if symbol not in self._paths:
+            raise KeyError(symbol)
+
+        df = self._reader(self._paths[symbol])
+        self._frames[symbol] = df
+        self._sizes[symbol] = frame_nbytes(df)
+        self.loads += 1
+        self._evict()
+        return df
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, symbol):
+        # Membership must not trigger a load
+        return symbol in self._paths
+
+    def _evict(self):
+        if self.memory_budget is None:
+            return
+        while len(self._frames) > 1 and self.memory_bytes > self.memory_budget:
+            symbol, _ = self._frames.popitem(last=False)
+            del self._sizes[symbol]
+            self.evictions += 1
+
+    @property
+    def memory_bytes(self):
+        """Combined size of the frames currently loaded."""
+        return sum(self._sizes.values())
+
+    @property
+    def loaded(self):
+        """Symbols currently in memory, least recently used first."""
+        return list(self._frames)
+
+    def evict(self, symbol):
+        """Drop one symbol from memory; it is reloaded on next access."""
+        self._frames.pop(symbol, None)
+        self._sizes.pop(symbol, None)
+
+    def clear(self):
+        """Drop every loaded frame."""
+        self._frames.clear()
+        self._sizes.clear()
+
+    def __repr__(self):
+        return (f"LazyBarFrames({len(self)} symbols, {len(self._frames)} loaded, "
+                f"{self.memory_bytes / 1024**2:.2f} MB)")
@@ -0,0 +1,220 @@
+"""
+Memory-mapped struct-of-arrays bar store.
+
+Each symbol gets a folder with one raw, contiguous binary file per field
+plus a small meta.json:
+
+    store/mmap/SPY/meta.json
+    store/mmap/SPY/open_time.bin    int64 nanoseconds since the epoch
+    store/mmap/SPY/open.bin         float64
+    ...
+    store/mmap/SPY/trade_count.bin  int64
+
+open_bars() maps those files read-only, so every notebook or worker
+process that opens the same symbol shares one copy in the OS page cache
+instead of holding a private pandas copy. The arrays and the DataFrame
+built by MmapBars.to_frame() are views onto the mapping, not copies.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .bars import DATA_DIR, STORE_DIR, TIME_COLUMN, find_bar_csvs, read_bar_csv
+
+MMAP_DIR = STORE_DIR / 'mmap'
+
+# field name -> (file stem, on-disk dtype)
+FIELDS = {
+    TIME_COLUMN: ('open_time', 'int64'),
+    'Open': ('open', 'float64'),
+    'High': ('high', 'float64'),
+    'Low': ('low', 'float64'),
+    'Close': ('close', 'float64'),
+    'Volume': ('volume', 'float64'),
+    'Trade count': ('trade_count', 'int64'),
+    'VWAP': ('vwap', 'float64'),
+}
+
+
+def _field_arrays(df):
+    """Split a bar frame into one contiguous array per field."""
+    arrays = {TIME_COLUMN: df.index.as_unit('ns').asi8}
+    for field, (_, dtype) in FIELDS.items():
+        if field != TIME_COLUMN:
+            arrays[field] = df[field].to_numpy(dtype=dtype)
+    return {field: np.ascontiguousarray(values) for field, values in arrays.items()}
+
+
+def _write_meta(symbol_dir, symbol, rows):
+    meta = {
+        'symbol': symbol,
+        'rows': int(rows),
+        'fields': {field: {'file': f'{stem}.bin', 'dtype': dtype}
+                   for field, (stem, dtype) in FIELDS.items()},
+    }
+    (symbol_dir / 'meta.json').write_text(json.dumps(meta, indent=2))
+
+
+def write_symbol(symbol, df, store_dir=MMAP_DIR):
+    """
+    Write one symbol's bars as per-field binary files (replacing old ones)
+    Args:
+        symbol (str): Symbol name
+        df (DataFrame): Bars indexed by 'Open time'
+        store_dir (str or Path): Root of the mmap store
+    Returns:
+        Path: The symbol's folder
+    """
+    symbol_dir = Path(store_dir) / symbol
+    symbol_dir.mkdir(parents=True, exist_ok=True)
+
+    for field, values in _field_arrays(df).items():
+        values.tofile(symbol_dir / f'{FIELDS[field][0]}.bin')
+    _write_meta(symbol_dir, symbol, len(df))
+    return symbol_dir
+
+
+def append_symbol(symbol, df, store_dir=MMAP_DIR):
+    """
+    Append bars to the end of one symbol's field files
+    Rows at or before the last stored 'Open time' are dropped, so replaying
+    the same new rows is harmless. Creates the symbol if it is missing.
+    Args:
+        symbol (str): Symbol name
+        df (DataFrame): New bars indexed by 'Open time'
+        store_dir (str or Path): Root of the mmap store
+    Returns:
+        int: Number of rows appended
+    """
+    symbol_dir = Path(store_dir) / symbol
+    if not (symbol_dir / 'meta.json').exists():
+        write_symbol(symbol, df, store_dir)
+        return len(df)
+
+    existing = MmapBars(symbol, store_dir)
+    if len(existing):
+        last = existing[TIME_COLUMN][-1]
+        df = df[df.index.as_unit('ns').asi8 > last]
+    rows = len(existing)
+    del existing
+
+    if len(df):
+        for field, values in _field_arrays(df).items():
+            with open(symbol_dir / f'{FIELDS[field][0]}.bin', 'ab') as f:
+                values.tofile(f)
+        # meta.json is updated last so readers never map past the written data
+        _write_meta(symbol_dir, symbol, rows + len(df))
+    return len(df)
+
+
+def convert_csvs_to_mmap(data_dir=DATA_DIR, store_dir=MMAP_DIR, symbols=None):
+    """
+    Convert the hourly bar CSVs into the mmap store
+    Args:
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        store_dir (str or Path): Root of the mmap store
+        symbols (list): Optional subset of symbols to convert
+    Returns:
+        dict: {symbol: number of rows written}
+    """
+    rows = {}
+    for symbol, csv_file in find_bar_csvs(data_dir, symbols).items():
+        df = read_bar_csv(csv_file)
+        write_symbol(symbol, df, store_dir)
+        rows[symbol] = len(df)
+        print(f"Converted {symbol}: {len(df)} rows")
+    return rows
+
+
+def list_symbols(store_dir=MMAP_DIR):
+    """
+    List the symbols present in the mmap store
+    Args:
+        store_dir (str or Path): Root of the mmap store
+    Returns:
+        list: Sorted symbol names
+    """
+    return sorted(p.parent.name for p in Path(store_dir).glob('*/meta.json'))
+
+
+class MmapBars:
+    """
+    Read-only, memory-mapped view of one symbol's bars
+    Index it by field name to get a zero-copy NumPy array, e.g. bars['Close'].
+    """
+
+    def __init__(self, symbol, store_dir=MMAP_DIR):
+        self.symbol = symbol
+        self.path = Path(store_dir) / symbol
+        meta = json.loads((self.path / 'meta.json').read_text())
+        self.rows = meta['rows']
+        self.arrays = {}
+        for field, spec in meta['fields'].items():
+            if self.rows:
+                mapped = np.memmap(self.path / spec['file'], dtype=spec['dtype'],
+                                   mode='r', shape=(self.rows,))
+                # Plain ndarray view; the mapping stays alive through .base
+                values = np.asarray(mapped)
+            else:
+                values = np.empty(0, dtype=spec['dtype'])
+            self.arrays[field] = values
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, field):
+        return self.arrays[field]
+
+    @property
+    def fields(self):
+        return [field for field in self.arrays if field != TIME_COLUMN]
+
+    @property
+    def times(self):
+        """DatetimeIndex viewing the int64 timestamp array (no copy)."""
+        stamps = self.arrays[TIME_COLUMN].view('datetime64[ns]')
+        return pd.DatetimeIndex(stamps, name=TIME_COLUMN, copy=False)
+
+    def to_frame(self, columns=None):
+        """
+        Build a DataFrame whose columns are views onto the mapped files
+        Args:
+            columns (list): Fields to include (None includes all)
+        Returns:
+            DataFrame: Read-only bars indexed by 'Open time'
+        """
+        columns = self.fields if columns is None else columns
+        data = {field: self.arrays[field] for field in columns}
+        return pd.DataFrame(data, index=self.times, copy=False)
+
+    def __repr__(self):
+        return f"MmapBars({self.symbol!r}, rows={self.rows})"
+
+
+def open_bars(symbols=None, store_dir=MMAP_DIR):
+    """
+    Map several symbols at once
+    Args:
+        symbols (list): Symbols to open (None opens every symbol in the store)
+        store_dir (str or Path): Root of the mmap store
+    Returns:
+        dict: {symbol: MmapBars}
+    """
+    symbols = list_symbols(store_dir) if symbols is None else symbols
+    return {symbol: MmapBars(symbol, store_dir) for symbol in symbols}
+
+
+def load_frames(symbols=None, columns=None, store_dir=MMAP_DIR):
+    """
+    Drop-in replacement for the dataframes dict, backed by the mmap store
+    Args:
+        symbols (list): Symbols to open (None opens every symbol in the store)
+        columns (list): Fields to include (None includes all)
+        store_dir (str or Path): Root of the mmap store
+    Returns:
+        dict: {symbol: read-only DataFrame indexed by 'Open time'}
+    """
+    return {symbol: bars.to_frame(columns)
+            for symbol, bars in open_bars(symbols, store_dir).items()}
@@ -0,0 +1,292 @@
+"""
+Out-of-core loading, feature computation and merging.
+
+The notebooks keep every symbol in one dataframes dict, which stops working
+once the universe no longer fits in RAM. This module runs the same steps
+one (symbol, time range) partition at a time and spills every intermediate
+to local disk, so at most one partition plus its lookback is in memory:
+
+    store/spill/<name>/<symbol>/part-00000.pkl ...
+    store/spill/<name>/<symbol>/parts.json        time range of every part
+
+Partition sizes are derived from a memory ceiling (memory_budget_mb), and
+each stage records the largest working set it actually saw (peak_bytes):
+
+    bars = spill_bars(memory_budget_mb=256)
+    feats = map_partitions(add_features, bars, lookback=19, name='features')
+    merged = merge_partitions(feats, daily_sentiment, name='features_sent')
+    for part in merged.iter_parts('SPY', start='2025-01-01'):
+        ...
+
+A SpillStore is also a read-only {symbol: DataFrame} mapping, so a single
+symbol can still be pulled in whole (merged['SPY']) when it fits.
+"""
+import json
+import shutil
+from collections.abc import Mapping
+from pathlib import Path
+
+import pandas as pd
+
+from .bars import BAR_COLUMNS, DATA_DIR, STORE_DIR, find_bar_csvs
+from .lazy import frame_nbytes
+from .stream import Chunk, iter_chunks
+
+SPILL_DIR = STORE_DIR / 'spill'
+
+# In-memory bytes per hourly bar (float64 columns plus the datetime index)
+ROW_BYTES = 8 * (len(BAR_COLUMNS) + 1)
+# Copies of a partition a typical stage holds at once (input, result, temporaries)
+WORKING_SET = 8
+
+
+def chunk_rows_for_budget(memory_budget_mb, row_bytes=ROW_BYTES, working_set=WORKING_SET):
+    """
+    Rows per partition that keep a stage under a memory ceiling
+    Args:
+        memory_budget_mb (float): Memory ceiling
+        row_bytes (int): In-memory size of one row
+        working_set (int): Copies of a partition held at once
+    Returns:
+        int: Rows per partition (at least 1,000)
+    """
+    return max(int(memory_budget_mb * 1024**2 / (row_bytes * working_set)), 1_000)
+
+
+class SpillStore(Mapping):
+    """
+    On-disk {symbol: time-ordered partitions} store
+    Args:
+        root (str or Path): Folder for this store's partitions
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.peak_bytes = 0
+
+    def _index_path(self, symbol):
+        return self.root / symbol / 'parts.json'
+
+    def _index(self, symbol):
+        path = self._index_path(symbol)
+        return json.loads(path.read_text()) if path.exists() else []
+
+    def write(self, symbol, df):
+        """
+        Append the next time partition of a symbol
+        Args:
+            symbol (str): Symbol name
+            df (DataFrame): Rows after every partition written so far
+        """
+        parts = self._index(symbol)
+        path = self.root / symbol / f'part-{len(parts):05d}.pkl'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_pickle(path, protocol=5)
+        parts.append({
+            'file': path.name,
+            'rows': len(df),
+            'start': None if df.empty else str(df.index[0]),
+            'end': None if df.empty else str(df.index[-1]),
+        })
+        self._index_path(symbol).write_text(json.dumps(parts, indent=2))
+
+    def parts(self, symbol, start=None, end=None):
+        """
+        Partitions of a symbol that overlap a time range
+        Args:
+            symbol (str): Symbol name
+            start (str or Timestamp): First stamp wanted (None for all)
+            end (str or Timestamp): Last stamp wanted (None for all)
+        Returns:
+            list: Partition entries ({'file', 'rows', 'start', 'end'})
+        """
+        start = None if start is None else pd.Timestamp(start)
+        end = None if end is None else pd.Timestamp(end)
+        selected = []
+        for part in self._index(symbol):
+            if part['start'] is None:
+                continue
+            if end is not None and pd.Timestamp(part['start']) > end:
+                continue
+            if start is not None and pd.Timestamp(part['end']) < start:
+                continue
+            selected.append(part)
+        return selected
+
+    def iter_parts(self, symbol, start=None, end=None):
+        """
+        Read a symbol one partition at a time
+        Args:
+            symbol (str): Symbol name
+            start (str or Timestamp): First stamp wanted (None for all)
+            end (str or Timestamp): Last stamp wanted (None for all)
+        Yields:
+            DataFrame: One partition, trimmed to [start, end]
+        """
+        for part in self.parts(symbol, start, end):
+            df = pd.read_pickle(self.root / symbol / part['file'])
+            yield df.loc[start:end] if start is not None or end is not None else df
+
+    def __getitem__(self, symbol):
+        if not self._index_path(symbol).exists():
+            raise KeyError(symbol)
+        frames = list(self.iter_parts(symbol))
+        return pd.concat(frames) if frames else pd.DataFrame()
+
+    def __iter__(self):
+        if not self.root.exists():
+            return iter([])
+        return iter(sorted(path.parent.name for path in self.root.glob('*/parts.json')))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, symbol):
+        return self._index_path(symbol).exists()
+
+    @property
+    def disk_bytes(self):
+        """Size of every spilled partition."""
+        return sum(path.stat().st_size for path in self.root.glob('*/*.pkl'))
+
+    def clear(self):
+        """Delete every partition of this store."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def __repr__(self):
+        return (f"SpillStore({str(self.root)!r}, {len(self)} symbols, "
+                f"{self.disk_bytes / 1024**2:.2f} MB on disk)")
+
+
+def _new_store(name, spill_dir):
+    store = SpillStore(Path(spill_dir) / name)
+    store.clear()
+    return store
+
+
+def _store_chunks(store, symbol, lookback):
+    # Same contract as stream.iter_chunks, over already spilled partitions
+    carry = None
+    for part in store.iter_parts(symbol):
+        context = 0 if carry is None else len(carry)
+        full = part if carry is None else pd.concat([carry, part])
+        carry = full.iloc[max(len(full) - lookback, 0):] if lookback else None
+        yield Chunk(symbol, full, context)
+
+
+def spill_bars(symbols=None, memory_budget_mb=512, name='bars', spill_dir=SPILL_DIR,
+               data_dir=DATA_DIR, window=None, verbose=True):
+    """
+    Load bar CSVs into a SpillStore without holding a whole file in memory
+    Args:
+        symbols (list): Symbols to load (None loads every bar CSV found)
+        memory_budget_mb (float): Memory ceiling used to size partitions
+        name (str): Store name under spill_dir (replaced if it exists)
+        spill_dir (str or Path): Root for spilled stores
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        window (str): Partition by whole 'D'/'W'/'M' windows instead of rows
+        verbose (bool): Print rows and partitions per symbol
+    Returns:
+        SpillStore: The loaded bars
+    """
+    store = _new_store(name, spill_dir)
+    chunk_rows = chunk_rows_for_budget(memory_budget_mb)
+    for symbol in find_bar_csvs(data_dir, symbols):
+        rows = 0
+        for chunk in iter_chunks(symbol, chunk_rows=chunk_rows, window=window,
+                                 data_dir=data_dir, read_rows=chunk_rows):
+            store.write(symbol, chunk.bars)
+            store.peak_bytes = max(store.peak_bytes, frame_nbytes(chunk.bars))
+            rows += len(chunk.bars)
+        if verbose:
+            print(f"{symbol}: {rows} rows in {len(store.parts(symbol))} partitions")
+    return store
+
+
+def map_partitions(func, source=None, lookback=0, memory_budget_mb=512, name='features',
+                   spill_dir=SPILL_DIR, symbols=None, data_dir=DATA_DIR, verbose=True):
+    """
+    Apply a frame -> frame/series function partition by partition
+    Each partition is passed with `lookback` earlier rows in front, so
+    rolling features are the same as on the whole history (see stream.py).
+    Args:
+        func (callable): DataFrame -> DataFrame or Series with the same index
+        source (SpillStore): Input partitions (None streams the bar CSVs)
+        lookback (int): Earlier rows func needs (e.g. window - 1 for rolling)
+        memory_budget_mb (float): Memory ceiling used to size CSV partitions
+            and checked against each partition's working set
+        name (str): Output store name under spill_dir (replaced if it exists)
+        spill_dir (str or Path): Root for spilled stores
+        symbols (list): Symbols to process (None processes all)
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        verbose (bool): Print progress and a warning if the ceiling is exceeded
+    Returns:
+        SpillStore: func's output, partitioned like the input
+    """
+    store = _new_store(name, spill_dir)
+    budget = memory_budget_mb * 1024**2
+    chunk_rows = chunk_rows_for_budget(memory_budget_mb)
+    if source is None:
+        symbols = list(find_bar_csvs(data_dir, symbols))
+    elif symbols is None:
+        symbols = list(source)
+
+    for symbol in symbols:
+        if source is None:
+            chunks = iter_chunks(symbol, chunk_rows=chunk_rows, lookback=lookback,
+                                 data_dir=data_dir, read_rows=chunk_rows)
+        else:
+            chunks = _store_chunks(source, symbol, lookback)
+        for chunk in chunks:
+            result = func(chunk.bars)
+            if isinstance(result, pd.Series):
+                result = result.to_frame()
+            store.peak_bytes = max(store.peak_bytes,
+                                   frame_nbytes(chunk.bars) + frame_nbytes(result))
+            store.write(symbol, result.iloc[chunk.lookback:])
+        if verbose:
+            print(f"{symbol}: {len(store.parts(symbol))} partitions written")
+
+    if verbose and store.peak_bytes > budget:
+        print(f"Warning: peak partition working set {store.peak_bytes / 1024**2:.1f} MB "
+              f"exceeded the {memory_budget_mb} MB ceiling; lower the budget or the lookback")
+    return store
+
+
+def merge_partitions(left, right, name='merged', spill_dir=SPILL_DIR, direction='backward',
+                     tolerance=None, verbose=True):
+    """
+    As-of join every partition of a SpillStore with a time-indexed frame
+    Typical use is attaching daily sentiment (the small side) to hourly
+    features (the large side) without loading the large side whole.
+    Args:
+        left (SpillStore): Large side, time-ordered partitions per symbol
+        right (DataFrame or Mapping): Sorted, time-indexed frame shared by
+            every symbol, or {symbol: frame}
+        name (str): Output store name under spill_dir (replaced if it exists)
+        spill_dir (str or Path): Root for spilled stores
+        direction (str): pd.merge_asof direction
+        tolerance (Timedelta): pd.merge_asof tolerance
+        verbose (bool): Print progress
+    Returns:
+        SpillStore: Merged partitions
+    """
+    store = _new_store(name, spill_dir)
+    for symbol in left:
+        other = right.get(symbol) if isinstance(right, Mapping) else right
+        for part in left.iter_parts(symbol):
+            if other is None or part.empty:
+                store.write(symbol, part)
+                continue
+            # Only the slice of the right side that can match this partition
+            lo = max(other.index.searchsorted(part.index[0], side='left') - 1, 0)
+            hi = other.index.searchsorted(part.index[-1], side='right') + 1
+            piece = other.iloc[lo:hi]
+            piece = piece.set_axis(piece.index.as_unit(part.index.unit))
+            merged = pd.merge_asof(part, piece, left_index=True, right_index=True,
+                                   direction=direction, tolerance=tolerance)
+            store.write(symbol, merged)
+            store.peak_bytes = max(store.peak_bytes, frame_nbytes(part) + frame_nbytes(merged))
+        if verbose:
+            print(f"{symbol}: merged {len(store.parts(symbol))} partitions")
+    return store
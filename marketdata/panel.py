@@ -0,0 +1,158 @@
+"""
+Aligned symbol x time x field panel cube.
+
+BarPanel aligns every symbol once onto the union of their 'Open time'
+stamps and keeps the bars in one dense float array of shape
+(symbols, times, fields) plus a boolean validity mask of shape
+(symbols, times). Cross-ETF work (correlations, spreads, cross-sectional
+ranks) can then index the cube directly instead of reindexing and
+joining per-symbol DataFrames for every computation.
+
+    panel = BarPanel.from_frames(dataframes)
+    closes = panel.sel(start='2024-01-01').field('Close')   # times x symbols
+    panel.returns().corr()
+"""
+import numpy as np
+import pandas as pd
+
+from .bars import BAR_COLUMNS, TIME_COLUMN
+
+
+class BarPanel:
+    """
+    Dense (symbols, times, fields) cube with a (symbols, times) validity mask
+    Missing bars hold NaN in values and False in mask. Trade count is stored
+    as float like every other field.
+    """
+
+    def __init__(self, symbols, times, fields, values, mask):
+        self.symbols = list(symbols)
+        self.times = pd.DatetimeIndex(times, name=TIME_COLUMN)
+        self.fields = list(fields)
+        self.values = values
+        self.mask = mask
+        self._symbol_pos = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._field_pos = {field: i for i, field in enumerate(self.fields)}
+
+    @classmethod
+    def from_frames(cls, dataframes, fields=None, dtype='float64'):
+        """
+        Align a {symbol: DataFrame} dict onto a union time calendar
+        Args:
+            dataframes (dict): Frames indexed by 'Open time'
+            fields (list): Columns to keep (defaults to the bar columns)
+            dtype (str): dtype of the cube ('float32' halves its size)
+        Returns:
+            BarPanel: The aligned cube
+        """
+        fields = BAR_COLUMNS if fields is None else list(fields)
+        symbols = list(dataframes)
+        stamps = [dataframes[s].index.as_unit('ns').asi8 for s in symbols]
+        times = np.unique(np.concatenate(stamps)) if stamps else np.empty(0, 'int64')
+
+        values = np.full((len(symbols), len(times), len(fields)), np.nan, dtype=dtype)
+        mask = np.zeros((len(symbols), len(times)), dtype=bool)
+        for i, symbol in enumerate(symbols):
+            positions = np.searchsorted(times, stamps[i])
+            values[i, positions, :] = dataframes[symbol][fields].to_numpy(dtype=dtype)
+            mask[i, positions] = True
+
+        return cls(symbols, times.view('datetime64[ns]'), fields, values, mask)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def _symbol_index(self, symbols):
+        if symbols is None:
+            return slice(None)
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        return [self._symbol_pos[symbol] for symbol in symbols]
+
+    def _field_index(self, fields):
+        if fields is None:
+            return slice(None)
+        if isinstance(fields, str):
+            fields = [fields]
+        return [self._field_pos[field] for field in fields]
+
+    def _time_slice(self, start=None, end=None):
+        lo = 0 if start is None else self.times.searchsorted(pd.Timestamp(start), 'left')
+        hi = len(self.times) if end is None else self.times.searchsorted(pd.Timestamp(end), 'right')
+        return slice(lo, hi)
+
+    def sel(self, symbols=None, start=None, end=None, fields=None):
+        """
+        Slice the cube by symbol, inclusive time range and field
+        A pure time-range selection returns views; picking symbols or
+        fields copies only the selected planes.
+        Args:
+            symbols (str or list): Symbols to keep
+            start: Inclusive lower bound on 'Open time'
+            end: Inclusive upper bound on 'Open time'
+            fields (str or list): Fields to keep
+        Returns:
+            BarPanel: The selected sub-cube
+        """
+        s_idx = self._symbol_index(symbols)
+        t_idx = self._time_slice(start, end)
+        f_idx = self._field_index(fields)
+
+        values = self.values[s_idx][:, t_idx][:, :, f_idx]
+        mask = self.mask[s_idx][:, t_idx]
+        return BarPanel(
+            np.asarray(self.symbols, dtype=object)[s_idx],
+            self.times[t_idx],
+            np.asarray(self.fields, dtype=object)[f_idx],
+            values,
+            mask,
+        )
+
+    def field(self, name):
+        """
+        One field as a times x symbols DataFrame (a view onto the cube)
+        Args:
+            name (str): Field name, e.g. 'Close'
+        Returns:
+            DataFrame: NaN where a symbol has no bar
+        """
+        plane = self.values[:, :, self._field_pos[name]].T
+        return pd.DataFrame(plane, index=self.times, columns=self.symbols, copy=False)
+
+    def common_mask(self):
+        """Boolean array over times: True where every symbol has a bar."""
+        return self.mask.all(axis=0)
+
+    def returns(self, field='Close', log=False):
+        """
+        Bar-to-bar returns for every symbol in one vectorized pass
+        Args:
+            field (str): Price field to use
+            log (bool): Log returns instead of simple returns
+        Returns:
+            DataFrame: times x symbols, NaN where either bar is missing
+        """
+        prices = self.values[:, :, self._field_pos[field]]
+        ratio = np.full(prices.shape, np.nan, dtype=prices.dtype)
+        ratio[:, 1:] = prices[:, 1:] / prices[:, :-1]
+        values = np.log(ratio) if log else ratio - 1
+        return pd.DataFrame(values.T, index=self.times, columns=self.symbols)
+
+    def to_frame(self, symbol, dropna=True):
+        """
+        One symbol back as a per-symbol DataFrame
+        Args:
+            symbol (str): Symbol name
+            dropna (bool): Drop the times where the symbol has no bar
+        Returns:
+            DataFrame: Bars indexed by 'Open time'
+        """
+        i = self._symbol_pos[symbol]
+        df = pd.DataFrame(self.values[i], index=self.times, columns=self.fields)
+        return df[self.mask[i]] if dropna else df
+
+    def __repr__(self):
+        span = f"{self.times[0]} to {self.times[-1]}" if len(self.times) else "empty"
+        return (f"BarPanel({len(self.symbols)} symbols x {len(self.times)} times x "
+                f"{len(self.fields)} fields, {span})")
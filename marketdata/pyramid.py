@@ -0,0 +1,266 @@
+"""
+Multi-resolution bar pyramid with a query router.
+
+Charts and features over multi-year ranges used to resample the hourly
+bars on every call. BarPyramid keeps every level pre-aggregated per symbol:
+
+    H   hourly bars as stored (indexed by 'Open time')
+    D   daily bars     (indexed by exchange 'Date', see resample.py)
+    W   weekly bars    (Monday of the week)
+    M   monthly bars   (first of the month)
+
+query() answers each request from the coarsest stored level that nests into
+the requested resolution and only rolls up what is left, so a five-year
+monthly query reads 60 rows instead of ~9,000 hourly ones. Quarterly ('Q')
+and yearly ('Y') requests are rolled up from M. Weeks do not nest into
+months, so M/Q/Y never read the weekly level. The requested range is
+widened to whole buckets of the requested resolution before routing, so
+every level that can answer returns the same bars.
+
+    pyramid = BarPyramid.from_frames(dataframes)
+    monthly = pyramid.query('SPY', '2021-01-01', '2025-06-30', 'M')
+    pyramid.last_route      # {'level': 'M', 'rows_read': 54, ...}
+
+update() appends new hourly rows and rebuilds only the buckets they touch
+(the current day, week and month), and save()/load() keep one pickle per
+symbol under store/pyramid.
+"""
+import pickle
+from pathlib import Path
+
+import pandas as pd
+
+from .bars import BAR_COLUMNS, STORE_DIR, atomic_write
+from .resample import FREQUENCIES, aggregate_bars, period_labels, resample_bars
+from .sessions import EXCHANGE_TZ
+
+PYRAMID_DIR = STORE_DIR / 'pyramid'
+
+LEVELS = ('H',) + FREQUENCIES
+RESOLUTIONS = LEVELS + ('Q', 'Y')
+
+# Stored levels that can answer each resolution, coarsest first
+ROUTES = {
+    'H': ('H',),
+    'D': ('D', 'H'),
+    'W': ('W', 'D', 'H'),
+    'M': ('M', 'D', 'H'),
+    'Q': ('M', 'D', 'H'),
+    'Y': ('M', 'D', 'H'),
+}
+
+
+def date_labels(dates, resolution):
+    """
+    Period label of exchange dates (used to roll D and M bars up further)
+    Args:
+        dates (DatetimeIndex): Naive exchange dates
+        resolution (str): 'D', 'W', 'M', 'Q' or 'Y'
+    Returns:
+        DatetimeIndex: Period start dates
+    """
+    dates = pd.DatetimeIndex(dates).normalize()
+    if resolution == 'D':
+        return dates
+    if resolution == 'W':
+        return dates - pd.to_timedelta(dates.dayofweek, unit='D')
+    months = {'M': 1, 'Q': 3, 'Y': 12}[resolution]
+    month = (dates.month - 1) // months * months + 1
+    return pd.DatetimeIndex(pd.to_datetime({'year': dates.year, 'month': month, 'day': 1}))
+
+
+def bucket_bounds(start, end, resolution):
+    """
+    Widen a date range to whole buckets of a resolution
+    Args:
+        start (str or Timestamp): First exchange date (None for open)
+        end (str or Timestamp): Last exchange date (None for open)
+        resolution (str): One of RESOLUTIONS
+    Returns:
+        tuple: (first date of start's bucket, last date of end's bucket)
+    """
+    if start is not None:
+        start = pd.Timestamp(start).normalize()
+        if resolution != 'H':
+            start = date_labels([start], resolution)[0]
+    if end is not None:
+        end = pd.Timestamp(end).normalize()
+        if resolution == 'W':
+            end = date_labels([end], 'W')[0] + pd.Timedelta(days=6)
+        elif resolution in ('M', 'Q', 'Y'):
+            months = {'M': 1, 'Q': 3, 'Y': 12}[resolution]
+            end = date_labels([end], resolution)[0] + pd.DateOffset(months=months) - pd.Timedelta(days=1)
+    return start, end
+
+
+def exchange_midnight(date):
+    """Naive-UTC stamp of 00:00 exchange time on a date."""
+    local = pd.Timestamp(date).normalize().tz_localize(EXCHANGE_TZ)
+    return local.tz_convert('UTC').tz_localize(None)
+
+
+class BarPyramid:
+    """
+    Pre-aggregated H/D/W/M levels per symbol
+    Args:
+        levels (dict): {symbol: {level: DataFrame}}
+    """
+
+    def __init__(self, levels=None):
+        self.levels = {symbol: dict(frames) for symbol, frames in (levels or {}).items()}
+        self.last_route = None
+        self._dirty = set(self.levels)
+
+    @classmethod
+    def from_frames(cls, dataframes):
+        """
+        Build every level from hourly frames (one resample pass per level)
+        Args:
+            dataframes (dict): {symbol: DataFrame indexed by 'Open time'}
+        Returns:
+            BarPyramid: The built pyramid
+        """
+        levels = {symbol: {'H': df[BAR_COLUMNS]} for symbol, df in dataframes.items()}
+        for freq in FREQUENCIES:
+            for symbol, df in resample_bars(dataframes, freq).items():
+                levels[symbol][freq] = df[BAR_COLUMNS]
+        return cls(levels)
+
+    @property
+    def symbols(self):
+        return list(self.levels)
+
+    def route(self, symbol, resolution):
+        """
+        Coarsest stored level that can answer a resolution
+        Args:
+            symbol (str): Symbol name
+            resolution (str): One of RESOLUTIONS
+        Returns:
+            str: Level to read
+        """
+        if resolution not in ROUTES:
+            raise ValueError(f"resolution must be one of {RESOLUTIONS}, got {resolution!r}")
+        stored = self.levels[symbol]
+        for level in ROUTES[resolution]:
+            if level in stored:
+                return level
+        raise KeyError(f"No level of {symbol} can answer {resolution!r}")
+
+    def query(self, symbol, start=None, end=None, resolution='D'):
+        """
+        Bars of one symbol at a resolution, read from the coarsest level
+        Args:
+            symbol (str): Symbol name
+            start (str or Timestamp): First exchange date (inclusive)
+            end (str or Timestamp): Last exchange date (inclusive)
+            resolution (str): 'H', 'D', 'W', 'M', 'Q' or 'Y'
+        Returns:
+            DataFrame: Bars indexed by 'Open time' (H) or 'Date'; start and
+            end are widened to whole buckets of the resolution first, so
+            the bars do not depend on the level that answers
+        """
+        level = self.route(symbol, resolution)
+        df = self.levels[symbol][level]
+        start, end = bucket_bounds(start, end, resolution)
+
+        if level == 'H':
+            lo = None if start is None else exchange_midnight(start)
+            hi = None if end is None else exchange_midnight(end + pd.Timedelta(days=1))
+            times = df.index
+            i = 0 if lo is None else times.searchsorted(lo, side='left')
+            j = len(times) if hi is None else times.searchsorted(hi, side='left')
+        else:
+            dates = df.index
+            i = 0 if start is None else dates.searchsorted(date_labels([start], level)[0], side='left')
+            j = len(dates) if end is None else dates.searchsorted(end, side='right')
+        rows = df.iloc[i:j]
+
+        self.last_route = {'symbol': symbol, 'resolution': resolution,
+                           'level': level, 'rows_read': len(rows)}
+        if level == resolution:
+            return rows
+        if level == 'H':
+            labels = period_labels(rows.index, 'D')
+            if resolution != 'D':
+                labels = date_labels(labels, resolution)
+        else:
+            labels = date_labels(rows.index, resolution)
+        return aggregate_bars(rows, labels)
+
+    def update(self, symbol, new_rows):
+        """
+        Append hourly rows and rebuild only the buckets they touch
+        Rows at or before the last stored hour are ignored.
+        Args:
+            symbol (str): Symbol name
+            new_rows (DataFrame): Hourly bars indexed by 'Open time'
+        Returns:
+            int: Hourly rows appended
+        """
+        new_rows = new_rows[BAR_COLUMNS].sort_index()
+        stored = self.levels.setdefault(symbol, {})
+        hourly = stored.get('H')
+        if hourly is not None and len(hourly):
+            new_rows = new_rows[new_rows.index > hourly.index[-1]]
+        if not len(new_rows):
+            return 0
+        hourly = new_rows if hourly is None else pd.concat([hourly, new_rows])
+        stored['H'] = hourly
+
+        first = new_rows.index[:1]
+        for freq in FREQUENCIES:
+            label = period_labels(first, freq)[0]
+            tail = hourly.iloc[hourly.index.searchsorted(exchange_midnight(label)):]
+            rebuilt = aggregate_bars(tail, period_labels(tail.index, freq))
+            old = stored.get(freq)
+            if old is not None:
+                old = old[old.index < label]
+                rebuilt = pd.concat([old, rebuilt])
+            stored[freq] = rebuilt[BAR_COLUMNS]
+
+        self._dirty.add(symbol)
+        return len(new_rows)
+
+    def save(self, store_dir=PYRAMID_DIR):
+        """
+        Pickle every changed symbol to store_dir/<symbol>.pkl
+        Args:
+            store_dir (str or Path): Pyramid folder
+        Returns:
+            list: Symbols written
+        """
+        store_dir = Path(store_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+        written = sorted(self._dirty)
+        for symbol in written:
+            with atomic_write(store_dir / f'{symbol}.pkl') as f:
+                pickle.dump(self.levels[symbol], f, protocol=5)
+        self._dirty.clear()
+        return written
+
+    @classmethod
+    def load(cls, symbols=None, store_dir=PYRAMID_DIR):
+        """
+        Read a saved pyramid
+        Args:
+            symbols (list): Symbols to load (None loads all)
+            store_dir (str or Path): Pyramid folder
+        Returns:
+            BarPyramid: The loaded pyramid
+        """
+        store_dir = Path(store_dir)
+        if symbols is None:
+            symbols = sorted(path.stem for path in store_dir.glob('*.pkl'))
+        levels = {}
+        for symbol in symbols:
+            with open(store_dir / f'{symbol}.pkl', 'rb') as f:
+                levels[symbol] = pickle.load(f)
+        pyramid = cls(levels)
+        pyramid._dirty.clear()
+        return pyramid
+
+    def __repr__(self):
+        counts = {level: sum(len(frames[level]) for frames in self.levels.values() if level in frames)
+                  for level in LEVELS}
+        return f"BarPyramid(symbols={len(self.levels)}, rows={counts})"
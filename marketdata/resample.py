@@ -0,0 +1,174 @@
+"""
+Vectorized hourly -> daily / weekly / monthly bar resampler with caching.
+
+resample_bars() stacks every symbol, tags each hourly bar with its exchange
+date (America/New_York, so a bar always lands on the trading day it belongs
+to) and aggregates all symbols in one groupby pass:
+
+    Open first, High max, Low min, Close last,
+    Volume sum, Trade count sum, VWAP volume-weighted
+
+Output bars are labelled like the yfinance daily pull behind
+QQQ_Historical_DayByDay.csv: daily bars by their date, weekly bars by the
+Monday of the week and monthly bars by the first of the month.
+
+cached_resample() keys results on a data version (a hash of the input
+frames, or any version string the caller already has, such as a catalog
+sha256) so daily features can be recomputed from the local hourly files
+without resampling again until the bars change.
+"""
+import hashlib
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .bars import STORE_DIR, TIME_COLUMN, stack_frames
+from .sessions import EXCHANGE_TZ
+
+RESAMPLE_DIR = STORE_DIR / 'resample'
+
+FREQUENCIES = ('D', 'W', 'M')
+
+_memory_cache = {}
+
+
+def period_labels(times, freq):
+    """
+    Exchange-calendar period label of every bar stamp
+    Args:
+        times (DatetimeIndex or Series): Naive-UTC 'Open time' stamps
+        freq (str): 'D', 'W' or 'M'
+    Returns:
+        DatetimeIndex: Period start dates (naive, midnight)
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"freq must be one of {FREQUENCIES}, got {freq!r}")
+    local = pd.DatetimeIndex(times).tz_localize('UTC').tz_convert(EXCHANGE_TZ)
+    days = local.tz_localize(None).normalize()
+    if freq == 'W':
+        return days - pd.to_timedelta(days.dayofweek, unit='D')
+    if freq == 'M':
+        return days - pd.to_timedelta(days.day - 1, unit='D')
+    return days
+
+
+def aggregate_bars(bars, labels, symbols=None):
+    """
+    Combine consecutive bars that share a label into one bar each
+    Works on hourly bars and on already aggregated ones (daily into
+    quarterly, ...), since VWAP is rebuilt from price x volume sums.
+    Args:
+        bars (DataFrame): Bar columns, time-ordered (within each symbol)
+        labels (array-like): Output bar label of every row
+        symbols (array-like): Symbol of every row, or None for one symbol
+    Returns:
+        DataFrame: Indexed by Date, or by (symbol, Date) when symbols is given
+    """
+    keys = {'Date': np.asarray(labels)}
+    if symbols is not None:
+        keys = {'symbol': np.asarray(symbols), **keys}
+    volume = bars['Volume'].to_numpy(dtype='float64')
+    work = pd.DataFrame(keys).assign(
+        Open=bars['Open'].to_numpy(),
+        High=bars['High'].to_numpy(),
+        Low=bars['Low'].to_numpy(),
+        Close=bars['Close'].to_numpy(),
+        Volume=volume,
+        trades=bars['Trade count'].to_numpy(),
+        _pv=bars['VWAP'].to_numpy(dtype='float64') * volume,
+    )
+    grouped = work.groupby(list(keys), sort=True)
+    out = grouped.agg(
+        Open=('Open', 'first'),
+        High=('High', 'max'),
+        Low=('Low', 'min'),
+        Close=('Close', 'last'),
+        Volume=('Volume', 'sum'),
+        trades=('trades', 'sum'),
+        _pv=('_pv', 'sum'),
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out['VWAP'] = out['_pv'] / out['Volume']
+    return out.drop(columns='_pv').rename(columns={'trades': 'Trade count'})
+
+
+def resample_stacked(bars, freq='D'):
+    """
+    Aggregate a stacked bar frame (see bars.stack_frames) in one pass
+    Args:
+        bars (DataFrame): Columns symbol, 'Open time' and the bar columns,
+            time-ordered within each symbol
+        freq (str): 'D', 'W' or 'M'
+    Returns:
+        DataFrame: Columns symbol, Date and the bar columns
+    """
+    labels = period_labels(bars[TIME_COLUMN], freq)
+    return aggregate_bars(bars, labels, bars['symbol'].to_numpy()).reset_index()
+
+
+def resample_bars(dataframes, freq='D'):
+    """
+    Resample every symbol's hourly bars in one vectorized pass
+    Args:
+        dataframes (dict): {symbol: DataFrame indexed by 'Open time'}
+        freq (str): 'D' (daily), 'W' (weekly) or 'M' (monthly)
+    Returns:
+        dict: {symbol: DataFrame indexed by 'Date'}
+    """
+    if not dataframes:
+        return {}
+    out = resample_stacked(stack_frames(dataframes), freq)
+    resampled = {}
+    for symbol, group in out.groupby('symbol', sort=False):
+        resampled[symbol] = group.drop(columns='symbol').set_index('Date')
+    return {symbol: resampled[symbol] for symbol in dataframes if symbol in resampled}
+
+
+def data_version(dataframes):
+    """
+    Content hash of a {symbol: DataFrame} dict
+    Args:
+        dataframes (dict): Frames to hash
+    Returns:
+        str: Hex digest that changes whenever any bar changes
+    """
+    digest = hashlib.sha256()
+    for symbol in sorted(dataframes):
+        digest.update(symbol.encode())
+        hashed = pd.util.hash_pandas_object(dataframes[symbol], index=True)
+        digest.update(hashed.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def cached_resample(dataframes, freq='D', version=None, cache_dir=RESAMPLE_DIR):
+    """
+    resample_bars() with an in-memory and on-disk cache per data version
+    Args:
+        dataframes (dict): {symbol: DataFrame indexed by 'Open time'}
+        freq (str): 'D', 'W' or 'M'
+        version (str): Data version to key on (None hashes the frames)
+        cache_dir (str or Path): Folder for cached results (None keeps
+            the cache in memory only)
+    Returns:
+        dict: {symbol: DataFrame indexed by 'Date'}
+    """
+    version = data_version(dataframes) if version is None else version
+    key = f'{freq}-{version[:32]}'
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    path = None if cache_dir is None else Path(cache_dir) / f'{key}.pkl'
+    if path is not None and path.exists():
+        with open(path, 'rb') as f:
+            result = pickle.load(f)
+    else:
+        result = resample_bars(dataframes, freq)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'wb') as f:
+                pickle.dump(result, f, protocol=5)
+
+    _memory_cache[key] = result
+    return result
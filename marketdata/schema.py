@@ -0,0 +1,96 @@
+"""
+Schema-driven bar reader with dtype downcasting.
+
+read_bars_typed() reads a *_hourly_ohlcv.csv straight into compact dtypes
+instead of the float64/int64 defaults:
+
+    Open time      parsed with the fixed TIME_FORMAT (no format inference)
+    prices         float64, or float32 with float32_prices=True
+    Trade count    int32
+    Volume         smallest unsigned int when every value is whole,
+                   float32 when it is fractional (VIX)
+
+memory_report() prints the before/after comparison that the summary cell
+in ImportCSVData.ipynb shows for one frame at a time.
+"""
+import numpy as np
+import pandas as pd
+
+from .bars import PRICE_COLUMNS, index_bars
+
+
+def bar_dtypes(float32_prices=False):
+    """
+    Column dtypes used while parsing a bar CSV
+    Args:
+        float32_prices (bool): Store Open/High/Low/Close/VWAP as float32
+    Returns:
+        dict: {column: dtype} for pd.read_csv
+    """
+    price_dtype = 'float32' if float32_prices else 'float64'
+    dtypes = {column: price_dtype for column in PRICE_COLUMNS}
+    # Volume is parsed wide and narrowed afterwards because some files
+    # (VIX) carry fractional volume
+    dtypes['Volume'] = 'float64'
+    dtypes['Trade count'] = 'int32'
+    return dtypes
+
+
+def compact_volume(volume):
+    """
+    Narrow a Volume column to the smallest dtype that holds it
+    Args:
+        volume (Series): float64 volume
+    Returns:
+        Series: Unsigned integer volume if every value is whole and
+        non-negative, float32 otherwise
+    """
+    values = volume.to_numpy()
+    if len(values) and np.isfinite(values).all() and (values >= 0).all() \
+            and (values == np.floor(values)).all():
+        return pd.to_numeric(volume, downcast='unsigned')
+    return volume.astype('float32')
+
+
+def read_bars_typed(path, float32_prices=False, compact=True):
+    """
+    Read one bar CSV into compact dtypes
+    Args:
+        path (str or Path): Path to a *_hourly_ohlcv.csv file
+        float32_prices (bool): Store prices as float32 (about 7 significant
+            digits, enough for cent-level ETF prices)
+        compact (bool): Narrow the Volume column with compact_volume()
+    Returns:
+        DataFrame: Bars indexed by 'Open time'
+    """
+    df = index_bars(pd.read_csv(path, dtype=bar_dtypes(float32_prices)))
+    if compact:
+        df['Volume'] = compact_volume(df['Volume'])
+    return df
+
+
+def memory_report(before, after, verbose=True):
+    """
+    Compare the memory footprint of two {symbol: DataFrame} dicts
+    Args:
+        before (dict): Frames as loaded by read_bar_csv()
+        after (dict): The same frames loaded by read_bars_typed()
+        verbose (bool): Print the table
+    Returns:
+        DataFrame: before_mb, after_mb and ratio per symbol plus a TOTAL row
+    """
+    rows = []
+    for symbol in before:
+        rows.append({
+            'symbol': symbol,
+            'before_mb': before[symbol].memory_usage(deep=True).sum() / 1024**2,
+            'after_mb': after[symbol].memory_usage(deep=True).sum() / 1024**2,
+        })
+    report = pd.DataFrame(rows, columns=['symbol', 'before_mb', 'after_mb']).set_index('symbol')
+    report.loc['TOTAL'] = report.sum()
+    report['ratio'] = report['before_mb'] / report['after_mb']
+
+    if verbose:
+        print("Memory usage (MB):")
+        print(report.round(3).to_string())
+    return report
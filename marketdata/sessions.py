@@ -0,0 +1,257 @@
+"""
+Session-aware trading calendar and gap detector for the hourly bars.
+
+The 'Open time' stamps in the *_hourly_ohlcv.csv files are naive UTC hour
+starts. Which hours exist on a given day depends on the NYSE session:
+
+    regular day   09:30-16:00 ET -> first bar at the first full hour after
+                  the open (10:00 ET), last bar starting at 15:00 ET
+    early close   09:30-13:00 ET -> 10:00 ET ... 13:00 ET; the vendor keeps
+                  one bar for the closing prints on half days
+    holiday       no bars
+
+and on daylight saving time, which moves those hours between 14-19 UTC
+(summer) and 15-20 UTC (winter). trading_sessions() builds that calendar
+from the exchange holiday rules and caches it per year range;
+expected_bar_times() turns it into the exact bar stamps, which is what
+reindexing and resampling should use instead of frequency strings.
+
+detect_gaps() compares a symbol's bars with the calendar. Hours outside
+the session (nights, weekends, holidays) are expected to be absent and
+are never reported; only session hours with no bar ('missing') and bars
+outside any session ('unexpected') come back.
+"""
+import datetime as dt
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .bars import TIME_COLUMN
+
+EXCHANGE_TZ = 'America/New_York'
+REGULAR_OPEN = dt.time(9, 30)
+REGULAR_CLOSE = dt.time(16, 0)
+EARLY_CLOSE = dt.time(13, 0)
+
+# One-off closures that no rule predicts (national days of mourning, storms)
+SPECIAL_CLOSURES = {
+    dt.date(2001, 9, 11), dt.date(2001, 9, 12), dt.date(2001, 9, 13), dt.date(2001, 9, 14),
+    dt.date(2004, 6, 11), dt.date(2007, 1, 2), dt.date(2012, 10, 29), dt.date(2012, 10, 30),
+    dt.date(2018, 12, 5), dt.date(2025, 1, 9),
+}
+
+
+def _easter(year):
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return dt.date(year, month, day + 1)
+
+
+def _nth_weekday(year, month, weekday, n):
+    """n-th given weekday of a month (n=-1 for the last one)."""
+    if n > 0:
+        first = dt.date(year, month, 1)
+        return first + dt.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = dt.date(year + month // 12, month % 12 + 1, 1) - dt.timedelta(days=1)
+    return last - dt.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day):
+    """Weekend holidays move to Friday (Saturday) or Monday (Sunday)."""
+    if day.weekday() == 5:
+        return day - dt.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + dt.timedelta(days=1)
+    return day
+
+
+def exchange_holidays(year):
+    """
+    Full-day NYSE closures for a year
+    Args:
+        year (int): Calendar year
+    Returns:
+        set: datetime.date holidays
+    """
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),                 # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),                 # Washington's Birthday
+        _easter(year) - dt.timedelta(days=2),        # Good Friday
+        _nth_weekday(year, 5, 0, -1),                # Memorial Day
+        _observed(dt.date(year, 7, 4)),              # Independence Day
+        _nth_weekday(year, 9, 0, 1),                 # Labor Day
+        _nth_weekday(year, 11, 3, 4),                # Thanksgiving
+        _observed(dt.date(year, 12, 25)),            # Christmas
+    }
+    # New Year's Day on a Saturday is not made up on the Friday before
+    new_year = dt.date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+    if year >= 2022:
+        holidays.add(_observed(dt.date(year, 6, 19)))  # Juneteenth
+    holidays.update(day for day in SPECIAL_CLOSURES if day.year == year)
+    return holidays
+
+
+def early_closes(year):
+    """
+    13:00 ET early-close days for a year
+    Args:
+        year (int): Calendar year
+    Returns:
+        set: datetime.date early closes
+    """
+    days = {_nth_weekday(year, 11, 3, 4) + dt.timedelta(days=1)}  # day after Thanksgiving
+    for day in (dt.date(year, 7, 3), dt.date(year, 12, 24)):
+        if day.weekday() < 4:
+            days.add(day)
+    return days - exchange_holidays(year)
+
+
+@lru_cache(maxsize=None)
+def _sessions_for_years(first_year, last_year):
+    days = pd.bdate_range(f'{first_year}-01-01', f'{last_year}-12-31')
+    holidays = set()
+    early = set()
+    for year in range(first_year, last_year + 1):
+        holidays |= exchange_holidays(year)
+        early |= early_closes(year)
+
+    dates = [day.date() for day in days if day.date() not in holidays]
+    is_early = np.array([day in early for day in dates], dtype=bool)
+    local_days = pd.DatetimeIndex(dates)
+    close_time = np.where(is_early, EARLY_CLOSE.hour * 60, REGULAR_CLOSE.hour * 60)
+
+    def to_utc(minutes):
+        local = local_days + pd.to_timedelta(minutes, unit='min')
+        return local.tz_localize(EXCHANGE_TZ).tz_convert('UTC').tz_localize(None)
+
+    sessions = pd.DataFrame({
+        'open': to_utc(REGULAR_OPEN.hour * 60 + REGULAR_OPEN.minute),
+        'close': to_utc(close_time),
+        'early_close': is_early,
+    }, index=pd.Index(local_days.date, name='date'))
+    return sessions
+
+
+def trading_sessions(start, end):
+    """
+    Trading sessions between two dates (cached per year range)
+    Args:
+        start: First date (anything pd.Timestamp accepts)
+        end: Last date
+    Returns:
+        DataFrame: Indexed by exchange date, with naive-UTC 'open' and
+        'close' and an 'early_close' flag
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    sessions = _sessions_for_years(start.year, end.year)
+    keep = (sessions.index >= start.date()) & (sessions.index <= end.date())
+    return sessions[keep]
+
+
+def session_bar_times(sessions):
+    """
+    Hourly bar stamps the vendor emits for a set of sessions
+    Args:
+        sessions (DataFrame): Output of trading_sessions()
+    Returns:
+        DatetimeIndex: Naive-UTC bar stamps
+    """
+    first = sessions['open'].dt.ceil('h')
+    # Last bar starts an hour before a regular close, at the close on half days
+    last = sessions['close'] - pd.to_timedelta(np.where(sessions['early_close'], 0, 1), unit='h')
+    counts = ((last - first) // pd.Timedelta(hours=1) + 1).clip(lower=0).to_numpy()
+
+    starts = np.repeat(first.to_numpy(), counts)
+    # Offset of each bar inside its session: 0, 1, 2, ... per session
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    stamps = starts + offsets.astype('timedelta64[h]')
+    return pd.DatetimeIndex(stamps, name=TIME_COLUMN)
+
+
+def expected_bar_times(start, end):
+    """
+    Every bar stamp the calendar expects between two timestamps
+    Args:
+        start: Inclusive lower bound (naive UTC)
+        end: Inclusive upper bound (naive UTC)
+    Returns:
+        DatetimeIndex: Naive-UTC bar stamps
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    stamps = session_bar_times(trading_sessions(start.normalize(), end.normalize()))
+    return stamps[(stamps >= start) & (stamps <= end)]
+
+
+def detect_gaps(df, start=None, end=None):
+    """
+    Separate real holes from expected absences in one symbol's bars
+    Args:
+        df (DataFrame or DatetimeIndex): Bars indexed by 'Open time'
+        start: Start of the window to check (defaults to the first bar)
+        end: End of the window to check (defaults to the last bar)
+    Returns:
+        DataFrame: Columns 'Open time' and kind ('missing' for a session
+        hour with no bar, 'unexpected' for a bar outside any session)
+    """
+    times = df if isinstance(df, pd.DatetimeIndex) else df.index
+    if not len(times):
+        return pd.DataFrame(columns=[TIME_COLUMN, 'kind'])
+    start = times.min() if start is None else pd.Timestamp(start)
+    end = times.max() if end is None else pd.Timestamp(end)
+    times = times[(times >= start) & (times <= end)]
+
+    expected = expected_bar_times(start, end)
+    missing = expected.difference(times)
+    unexpected = times.difference(expected)
+    gaps = pd.DataFrame({
+        TIME_COLUMN: missing.append(unexpected),
+        'kind': ['missing'] * len(missing) + ['unexpected'] * len(unexpected),
+    })
+    return gaps.sort_values(TIME_COLUMN, ignore_index=True)
+
+
+def detect_gaps_all(dataframes, start=None, end=None):
+    """
+    detect_gaps() for every symbol, stacked into one table
+    Args:
+        dataframes (dict): {symbol: DataFrame indexed by 'Open time'}
+        start: Start of the window to check (defaults to each first bar)
+        end: End of the window to check (defaults to each last bar)
+    Returns:
+        DataFrame: Columns symbol, 'Open time', kind
+    """
+    parts = []
+    for symbol, df in dataframes.items():
+        gaps = detect_gaps(df, start, end)
+        gaps.insert(0, 'symbol', symbol)
+        parts.append(gaps)
+    if not parts:
+        return pd.DataFrame(columns=['symbol', TIME_COLUMN, 'kind'])
+    return pd.concat(parts, ignore_index=True)
+
+
+def reindex_to_calendar(df, start=None, end=None):
+    """
+    Reindex bars onto the expected session stamps (NaN for missing bars)
+    Args:
+        df (DataFrame): Bars indexed by 'Open time'
+        start: Start of the window (defaults to the first bar)
+        end: End of the window (defaults to the last bar)
+    Returns:
+        DataFrame: One row per expected bar
+    """
+    start = df.index.min() if start is None else start
+    end = df.index.max() if end is None else end
+    return df.reindex(expected_bar_times(start, end))
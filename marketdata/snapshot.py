@@ -0,0 +1,158 @@
+"""
+Fingerprinted warm-start snapshot of the loaded bar set.
+
+load_dataframes() is a cached version of the ImportCSVData.ipynb loading
+loop. The parsed {symbol: DataFrame} dict is pickled (protocol 5, which
+writes the NumPy buffers as-is) together with a fingerprint of every
+source CSV: size, mtime and SHA-256. On the next call a file whose size
+and mtime match is trusted without reading it; if only the mtime moved
+(a git checkout, a copy) the content hash decides. Only the CSVs that
+really changed are parsed again, so an unchanged data folder is restored
+straight from the snapshot.
+
+The snapshot is a local pickle: only load snapshots you wrote yourself.
+"""
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+from .bars import DATA_DIR, STORE_DIR, atomic_write, find_bar_csvs, read_bar_csv
+
+SNAPSHOT_PATH = STORE_DIR / 'snapshot.pkl'
+SNAPSHOT_VERSION = 1
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """
+    SHA-256 of a file's contents
+    Args:
+        path (str or Path): File to hash
+        chunk_size (int): Bytes read per step
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(path):
+    """
+    Size, mtime and content hash of a file
+    Args:
+        path (str or Path): File to fingerprint
+    Returns:
+        dict: {'size', 'mtime_ns', 'sha256'}
+    """
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_sha256(path)}
+
+
+def is_unchanged(path, saved):
+    """
+    Check a file against a saved fingerprint
+    The hash is only computed when size matches but mtime does not.
+    Args:
+        path (str or Path): File to check
+        saved (dict): Fingerprint recorded earlier (or None)
+    Returns:
+        bool: True if the contents are the same
+    """
+    if saved is None:
+        return False
+    stat = os.stat(path)
+    if stat.st_size != saved['size']:
+        return False
+    if stat.st_mtime_ns == saved['mtime_ns']:
+        return True
+    return file_sha256(path) == saved['sha256']
+
+
+def read_snapshot(snapshot_path=SNAPSHOT_PATH):
+    """
+    Load a snapshot file
+    Args:
+        snapshot_path (str or Path): Pickle written by write_snapshot()
+    Returns:
+        dict: {'fingerprints': {...}, 'frames': {...}}, empty if missing or
+        written by another snapshot version
+    """
+    snapshot_path = Path(snapshot_path)
+    empty = {'fingerprints': {}, 'frames': {}}
+    if not snapshot_path.exists():
+        return empty
+    with open(snapshot_path, 'rb') as f:
+        snapshot = pickle.load(f)
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        return empty
+    return snapshot
+
+
+def write_snapshot(frames, fingerprints, snapshot_path=SNAPSHOT_PATH, reader_name=None):
+    """
+    Write frames and their source fingerprints atomically
+    Args:
+        frames (dict): {symbol: DataFrame}
+        fingerprints (dict): {symbol: fingerprint of its CSV}
+        snapshot_path (str or Path): Output pickle
+        reader_name (str): Function that parsed the frames
+    """
+    snapshot = {'version': SNAPSHOT_VERSION, 'reader': reader_name,
+                'fingerprints': fingerprints, 'frames': frames}
+    with atomic_write(snapshot_path) as f:
+        pickle.dump(snapshot, f, protocol=5)
+
+
+def load_dataframes(symbols=None, data_dir=DATA_DIR, snapshot_path=SNAPSHOT_PATH,
+                    reader=read_bar_csv, verbose=True):
+    """
+    Load the dataframes dict, reusing the snapshot for unchanged CSVs
+    Args:
+        symbols (list): Symbols to load (None loads every bar CSV found)
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        snapshot_path (str or Path): Snapshot pickle to read and refresh
+        reader (callable): path -> DataFrame used for changed files
+        verbose (bool): Print which symbols were restored or re-parsed
+    Returns:
+        dict: {symbol: DataFrame indexed by 'Open time'}
+    """
+    reader_name = f'{reader.__module__}.{reader.__qualname__}'
+    snapshot = read_snapshot(snapshot_path)
+    if snapshot.get('reader') != reader_name:
+        # Frames parsed by a different reader (e.g. typed vs. default dtypes)
+        snapshot = {'fingerprints': {}, 'frames': {}}
+    saved_prints = snapshot['fingerprints']
+    saved_frames = snapshot['frames']
+
+    dataframes = {}
+    fingerprints = dict(saved_prints)
+    restored, parsed = [], []
+    dirty = False
+    for symbol, csv_file in find_bar_csvs(data_dir, symbols).items():
+        saved = saved_prints.get(symbol)
+        if symbol in saved_frames and is_unchanged(csv_file, saved):
+            dataframes[symbol] = saved_frames[symbol]
+            stat = os.stat(csv_file)
+            if stat.st_mtime_ns != saved['mtime_ns']:
+                # Same content, new mtime: remember it to skip the hash next time
+                fingerprints[symbol] = dict(saved, mtime_ns=stat.st_mtime_ns)
+                dirty = True
+            restored.append(symbol)
+        else:
+            dataframes[symbol] = reader(csv_file)
+            fingerprints[symbol] = fingerprint(csv_file)
+            parsed.append(symbol)
+            dirty = True
+
+    if dirty:
+        frames = dict(saved_frames)
+        frames.update(dataframes)
+        write_snapshot(frames, fingerprints, snapshot_path, reader_name)
+
+    if verbose:
+        print(f"Restored from snapshot: {restored}")
+        print(f"Parsed from CSV: {parsed}")
+    return dataframes
@@ -0,0 +1,128 @@
+"""
+Embedded, in-process SQL over every project dataset.
+
+connect() opens a DuckDB connection (no server, nothing to install beyond
+`pip install duckdb`) and registers each dataset as a view:
+
+    bars                    all hourly bars, one row per (symbol, 'Open time');
+                            read from the parquet store when it exists (see
+                            columnar.py), otherwise from the CSVs
+    <dataset>               the latest version of every other dataset in the
+                            catalog, e.g. qqq_historical_daybyday,
+                            qqq_gdelt_news, qqq_reddit_data,
+                            qqq_gdelt_daily_sentiment; datasets saved through
+                            artifacts.py resolve to the manifest's latest
+                            object rather than an older timestamped CSV
+
+The views read the files directly, so DuckDB pushes column projections
+and WHERE filters down into the parquet/CSV scans (including symbol/year
+partition pruning on the parquet store), and joins and aggregations run in
+its columnar engine. Only the final result becomes a DataFrame:
+
+    con = connect()
+    query('''
+        SELECT symbol, date_trunc('month', "Open time") AS month, avg(Close)
+        FROM bars WHERE symbol IN ('SPY', 'QQQ') AND "Open time" >= '2024-01-01'
+        GROUP BY ALL ORDER BY ALL
+    ''', con)
+"""
+import re
+from pathlib import Path
+
+import duckdb
+
+from .bars import CSV_SUFFIX, DATA_DIR, STORE_DIR, find_bar_csvs
+from .artifacts import ARTIFACT_DIR
+from .catalog import CATALOG_PATH, build_catalog, latest_versions
+
+# Same folder as columnar.PARQUET_DIR, without importing pyarrow
+PARQUET_DIR = STORE_DIR / 'parquet'
+
+
+def view_name(dataset):
+    """
+    SQL-safe view name for a logical dataset
+    Args:
+        dataset (str): e.g. 'QQQ_tech+sent_110325'
+    Returns:
+        str: e.g. 'qqq_tech_sent_110325'
+    """
+    return re.sub(r'[^0-9a-z]+', '_', dataset.lower()).strip('_')
+
+
+def _sql_string(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _sql_list(values):
+    return '[' + ', '.join(_sql_string(value) for value in values) + ']'
+
+
+def bars_source(data_dir=DATA_DIR, parquet_dir=PARQUET_DIR):
+    """
+    Table expression that scans every hourly bar
+    Args:
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        parquet_dir (str or Path): Parquet store (used if it has files)
+    Returns:
+        str: SQL table expression with a 'symbol' column
+    """
+    parquet_dir = Path(parquet_dir)
+    if parquet_dir.exists() and any(parquet_dir.glob('**/*.parquet')):
+        pattern = _sql_string((parquet_dir / '**' / '*.parquet').as_posix())
+        return (f"(SELECT * EXCLUDE (year) FROM read_parquet({pattern}, "
+                f"hive_partitioning = true, hive_types = {{'symbol': VARCHAR, 'year': SMALLINT}}))")
+
+    files = [path.as_posix() for path in find_bar_csvs(data_dir).values()]
+    symbol = f"regexp_extract(filename, '([^/]+){CSV_SUFFIX}\\.csv$', 1)"
+    return (f"(SELECT {symbol} AS symbol, * EXCLUDE (filename) "
+            f"FROM read_csv({_sql_list(files)}, filename = true, union_by_name = true))")
+
+
+def connect(data_dir=DATA_DIR, parquet_dir=PARQUET_DIR, catalog_path=CATALOG_PATH,
+            artifact_dir=ARTIFACT_DIR, database=':memory:', verbose=True):
+    """
+    Open DuckDB with a view per dataset
+    Args:
+        data_dir (str or Path): Repository / data root
+        parquet_dir (str or Path): Parquet bar store (see columnar.py)
+        catalog_path (str or Path): Catalog used to find the other datasets
+        artifact_dir (str or Path): Artifact store whose manifest gives the
+            latest version of each saved dataset
+        database (str): DuckDB database file (':memory:' keeps nothing on disk)
+        verbose (bool): Print the registered views
+    Returns:
+        duckdb.DuckDBPyConnection: Connection with the views registered
+    """
+    con = duckdb.connect(database)
+    con.execute(f"CREATE OR REPLACE VIEW bars AS SELECT * FROM {bars_source(data_dir, parquet_dir)}")
+    views = ['bars']
+
+    catalog = build_catalog(data_dir, catalog_path, artifact_dir, verbose=False)
+    if not catalog.empty:
+        others = latest_versions(catalog)
+        others = others[~others['dataset'].str.endswith(CSV_SUFFIX)]
+        for row in others.itertuples():
+            name = view_name(row.dataset)
+            path = _sql_string((Path(data_dir) / row.path).as_posix())
+            con.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM read_csv_auto({path})")
+            views.append(name)
+
+    if verbose:
+        print(f"Registered views: {views}")
+    return con
+
+
+def query(sql, con=None, params=None):
+    """
+    Run SQL against the project views and return a DataFrame
+    Args:
+        sql (str): Query text
+        con (duckdb.DuckDBPyConnection): Connection from connect() (opened
+            on demand if None)
+        params (list): Optional prepared-statement parameters
+    Returns:
+        DataFrame: Query result
+    """
+    con = connect(verbose=False) if con is None else con
+    return con.execute(sql, params or []).df()
@@ -0,0 +1,136 @@
+"""
+Chunked streaming bar reader with bounded memory.
+
+iter_chunks() reads a bar CSV with pd.read_csv(chunksize=...) and yields
+it either in fixed-size row chunks or in whole time windows (days, weeks,
+months, or any pandas frequency such as '4h'). Only one read buffer plus
+the carried-over rows are ever in memory, whatever the file size.
+
+Each yielded Chunk carries the last `lookback` rows of the data before it
+in front of its own rows, so rolling computations are exact across chunk
+boundaries:
+
+    for chunk in iter_chunks('SPY', chunk_rows=10_000, lookback=19):
+        ma_20 = chunk.bars['Close'].rolling(20).mean()
+        write(ma_20.iloc[chunk.lookback:])          # only the chunk's own rows
+
+stream_apply() wraps exactly that pattern.
+"""
+from collections import namedtuple
+
+import pandas as pd
+
+from .bars import DATA_DIR, find_bar_csvs, index_bars
+from .resample import FREQUENCIES, period_labels
+
+
+class Chunk(namedtuple('Chunk', ['symbol', 'bars', 'lookback'])):
+    """
+    One piece of a streamed bar file
+    bars holds `lookback` carried rows followed by the chunk's own rows.
+    """
+    __slots__ = ()
+
+    @property
+    def new(self):
+        """The chunk's own rows, without the carried lookback."""
+        return self.bars.iloc[self.lookback:]
+
+
+def _window_keys(index, window):
+    if window in FREQUENCIES:
+        return period_labels(index, window)
+    return index.floor(window)
+
+
+def _read_blocks(csv_file, read_rows):
+    for block in pd.read_csv(csv_file, chunksize=read_rows):
+        yield index_bars(block)
+
+
+def iter_chunks(symbol, chunk_rows=None, window=None, lookback=0, data_dir=DATA_DIR,
+                read_rows=50_000):
+    """
+    Stream one symbol's bars in row chunks or time windows
+    Args:
+        symbol (str): Symbol name
+        chunk_rows (int): Rows per chunk (ignored when window is given)
+        window (str): 'D', 'W', 'M' (exchange calendar, see resample.py) or
+            a pandas frequency such as '4h'; each chunk holds whole windows
+        lookback (int): Rows from before each chunk to carry in front of it
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        read_rows (int): Rows per underlying read_csv block
+    Yields:
+        Chunk: (symbol, bars, lookback)
+    """
+    if chunk_rows is None and window is None:
+        raise ValueError("Pass chunk_rows or window")
+    csv_file = find_bar_csvs(data_dir, [symbol])[symbol]
+
+    pending = None
+    carry = None
+
+    def emit(bars):
+        nonlocal carry
+        context = 0 if carry is None else len(carry)
+        full = bars if carry is None else pd.concat([carry, bars])
+        carry = full.iloc[max(len(full) - lookback, 0):] if lookback else None
+        return Chunk(symbol, full, context)
+
+    for block in _read_blocks(csv_file, read_rows):
+        pending = block if pending is None else pd.concat([pending, block])
+
+        if window is None:
+            while len(pending) >= chunk_rows:
+                yield emit(pending.iloc[:chunk_rows])
+                pending = pending.iloc[chunk_rows:]
+        else:
+            keys = _window_keys(pending.index, window)
+            # Everything before the last (possibly unfinished) window is complete
+            complete = int((keys < keys[-1]).sum())
+            if complete:
+                done = pending.iloc[:complete]
+                done_keys = keys[:complete]
+                for _, part in done.groupby(done_keys, sort=False):
+                    yield emit(part)
+                pending = pending.iloc[complete:]
+
+    if pending is not None and len(pending):
+        if window is None:
+            yield emit(pending)
+        else:
+            for _, part in pending.groupby(_window_keys(pending.index, window), sort=False):
+                yield emit(part)
+
+
+def iter_universe(symbols=None, data_dir=DATA_DIR, **kwargs):
+    """
+    Stream several symbols one after another
+    Args:
+        symbols (list): Symbols to stream (None streams every bar CSV found)
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        **kwargs: Passed to iter_chunks() (chunk_rows, window, lookback, ...)
+    Yields:
+        Chunk: (symbol, bars, lookback)
+    """
+    for symbol in find_bar_csvs(data_dir, symbols):
+        yield from iter_chunks(symbol, data_dir=data_dir, **kwargs)
+
+
+def stream_apply(func, symbols=None, lookback=0, data_dir=DATA_DIR, **kwargs):
+    """
+    Apply a frame -> frame/series function chunk by chunk
+    func sees each chunk with its lookback rows; only the rows belonging to
+    the chunk itself are yielded, so the output equals func(whole history)
+    for any computation that needs at most `lookback` earlier rows.
+    Args:
+        func (callable): DataFrame -> DataFrame or Series with the same index
+        symbols (list): Symbols to stream (None streams every bar CSV found)
+        lookback (int): Earlier rows func needs (e.g. window - 1 for rolling)
+        data_dir (str or Path): Folder holding the *_hourly_ohlcv.csv files
+        **kwargs: Passed to iter_chunks() (chunk_rows or window, ...)
+    Yields:
+        tuple: (symbol, result rows for the chunk)
+    """
+    for chunk in iter_universe(symbols, data_dir, lookback=lookback, **kwargs):
+        yield chunk.symbol, func(chunk.bars).iloc[chunk.lookback:]
@@ -0,0 +1,39 @@
+"""
+Fetch path tests against LocalTransport (no network access needed).
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from marketdata import BAR_COLUMNS, find_bar_csvs, read_bar_csv  # noqa: E402
+from marketdata.fetch import LocalTransport, fetch_histories, normalize_history  # noqa: E402
+
+
+def test_fetch_histories_matches_local_bars():
+    transport = LocalTransport()
+    frames, errors = fetch_histories(['SPY', 'QQQ', 'NOPE'], interval='1h', start='2025-01-01',
+                                     transport=transport, retries=0, verbose=False)
+
+    assert list(frames) == ['SPY', 'QQQ']
+    assert list(errors) == ['NOPE']
+    assert len(transport.calls) == 3
+    for symbol, df in frames.items():
+        expected = read_bar_csv(find_bar_csvs(symbols=[symbol])[symbol]).loc['2025-01-01':]
+        pd.testing.assert_frame_equal(df, expected)
+
+
+def test_normalize_history_keeps_actions():
+    index = pd.DatetimeIndex(['2025-03-21', '2025-03-24'], name='Date').tz_localize('America/New_York')
+    raw = pd.DataFrame({'Open': [1, 2], 'High': [1, 2], 'Low': [1, 2], 'Close': [1, 2],
+                        'Volume': [10, 20], 'Dividends': [0.0, 0.7], 'Stock Splits': [0.0, 0.0]},
+                       index=index)
+    df = normalize_history(raw)
+
+    assert list(df.columns) == BAR_COLUMNS + ['Dividends', 'Stock Splits']
+    assert df.index.name == 'Open time'
+    assert str(df.index[0]) == '2025-03-21 04:00:00'
+    assert df['Close'].dtype == 'float64'
+    assert df[['Trade count', 'VWAP']].isna().all().all()
@@ -0,0 +1,66 @@
+"""
+Incremental history store tests against a fake split-adjusting transport.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from marketdata.adjust import actions_from_history  # noqa: E402
+from marketdata.history import fetch_incremental  # noqa: E402
+
+
+class SplitTransport:
+    """Daily bars that, like yfinance, are split-adjusted as of the request."""
+
+    def __init__(self, split_time, ratio):
+        self.index = pd.date_range('2024-01-02 05:00', periods=20, freq='D', name='Date')
+        self.split_time = pd.Timestamp(split_time)
+        self.ratio = ratio
+        self.today = self.split_time
+        self.calls = []
+
+    def __call__(self, ticker, interval, start=None, end=None, period=None):
+        self.calls.append((start, end))
+        index = self.index[(self.index >= start) & (self.index < min(pd.Timestamp(end), self.today))]
+        # Trades at 100 before the split and 100 / ratio after it; earlier bars
+        # are rescaled only once the split has happened
+        split_done = self.today > self.split_time
+        scale = np.where(split_done | (index >= self.split_time), self.ratio, 1.0)
+        close = 100.0 / scale
+        return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                             'Volume': 1000 * scale, 'Dividends': 0.0,
+                             'Stock Splits': np.where(index == self.split_time, self.ratio, 0.0)},
+                            index=index)
+
+
+def test_new_split_refetches_stored_bars(tmp_path):
+    transport = SplitTransport('2024-01-12 05:00', 2.0)
+    fetch_incremental(['QQQ'], start='2024-01-01', transport=transport, store_dir=tmp_path,
+                      retries=0, verbose=False)
+
+    transport.today = pd.Timestamp('2024-02-01')
+    frames, rows = fetch_incremental(['QQQ'], start='2024-01-01', transport=transport,
+                                     store_dir=tmp_path, retries=0, verbose=False)
+
+    qqq = frames['QQQ']
+    assert len(qqq) == 20
+    assert (qqq['Close'] == 50.0).all()
+    assert (qqq['Volume'] == 2000.0).all()
+    assert transport.calls[-1] == (qqq.index[0], pd.Timestamp('2024-01-12 05:00'))
+    # Ten bars re-fetched, plus eleven from the newest stored bar onwards
+    assert rows['QQQ'] == 21
+
+
+def test_split_adjusted_history_keeps_only_cash_actions():
+    index = pd.DatetimeIndex(['2024-03-18 04:00', '2024-06-10 04:00'])
+    history = pd.DataFrame({'Close': [1.0, 1.0], 'Dividends': [0.5, 0.0],
+                            'Stock Splits': [0.0, 4.0]}, index=index)
+
+    assert list(actions_from_history(history)['split']) == [1.0, 4.0]
+    actions = actions_from_history(history, split_adjusted=True)
+    assert list(actions['cash']) == [0.5]
+    assert list(actions['split']) == [1.0]
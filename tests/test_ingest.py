@@ -0,0 +1,68 @@
+"""
+Tail-append ingestion tests on small copies of a bar CSV.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from marketdata import find_bar_csvs  # noqa: E402
+from marketdata.columnar import convert_csvs_to_parquet, load_bars  # noqa: E402
+from marketdata.ingest import ingest_tail, mark_ingested, read_new_rows  # noqa: E402
+from marketdata.mmap_store import convert_csvs_to_mmap, load_frames  # noqa: E402
+
+
+def _spy_lines():
+    return find_bar_csvs(symbols=['SPY'])['SPY'].read_text().splitlines(keepends=True)
+
+
+def _write_csv(data_dir, lines):
+    path = data_dir / 'SPY_hourly_ohlcv.csv'
+    path.write_text(''.join(lines))
+    return path
+
+
+def test_ingest_without_watermark_does_not_duplicate_stores(tmp_path):
+    lines = _spy_lines()[:100]
+    _write_csv(tmp_path, lines)
+    parquet_dir = tmp_path / 'parquet'
+    mmap_dir = tmp_path / 'mmap'
+    convert_csvs_to_parquet(tmp_path, parquet_dir)
+    convert_csvs_to_mmap(tmp_path, mmap_dir)
+
+    new_rows = ingest_tail(data_dir=tmp_path, mmap_dir=mmap_dir, parquet_dir=parquet_dir,
+                           watermark_path=tmp_path / 'watermarks.json', verbose=False)
+
+    assert len(new_rows['SPY']) == 99
+    assert len(load_bars(store_dir=parquet_dir)['SPY']) == 99
+    assert len(load_frames(store_dir=mmap_dir)['SPY']) == 99
+
+
+def test_header_only_watermark_picks_up_appended_rows(tmp_path):
+    lines = _spy_lines()[:50]
+    _write_csv(tmp_path, lines[:1])
+    watermark_path = tmp_path / 'watermarks.json'
+    mark_ingested(data_dir=tmp_path, watermark_path=watermark_path)
+
+    _write_csv(tmp_path, lines)
+    new_rows = ingest_tail(data_dir=tmp_path, watermark_path=watermark_path, verbose=False)
+    assert len(new_rows['SPY']) == 49
+
+    again = ingest_tail(data_dir=tmp_path, watermark_path=watermark_path, verbose=False)
+    assert again['SPY'].empty
+
+
+def test_rewrite_that_does_not_shrink_is_read_in_full(tmp_path):
+    lines = _spy_lines()[:50]
+    csv_file = _write_csv(tmp_path, lines[:40])
+    watermark = mark_ingested(data_dir=tmp_path, watermark_path=tmp_path / 'watermarks.json')['SPY']
+
+    # Drop two early rows and append three later ones: the file grows, but the
+    # bytes at the old offset are no longer the start of the appended rows
+    _write_csv(tmp_path, lines[:1] + lines[3:43])
+    assert csv_file.stat().st_size >= watermark['offset']
+    df, new_watermark = read_new_rows(csv_file, watermark)
+
+    assert [str(t) for t in df.index] == [line.split(',')[0] for line in lines[40:43]]
+    assert new_watermark['last_time'] == str(df.index[-1])
+    assert new_watermark['offset'] == csv_file.stat().st_size
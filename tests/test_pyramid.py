@@ -0,0 +1,40 @@
+"""
+BarPyramid routing tests: every level that can answer returns the same bars.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from marketdata import find_bar_csvs, read_bar_csv  # noqa: E402
+from marketdata.pyramid import BarPyramid  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def pyramids():
+    spy = read_bar_csv(find_bar_csvs(symbols=['SPY'])['SPY'])
+    full = BarPyramid.from_frames({'SPY': spy})
+    hourly = BarPyramid({'SPY': {'H': full.levels['SPY']['H']}})
+    return full, hourly
+
+
+@pytest.mark.parametrize('start, end, resolution', [
+    ('2024-01-10', '2024-02-20', 'D'),
+    ('2024-01-10', '2024-02-20', 'W'),
+    ('2022-02-15', '2022-11-03', 'M'),
+    ('2022-02-15', '2023-05-20', 'Q'),
+    ('2021-06-30', '2024-03-01', 'Y'),
+])
+def test_routed_query_matches_hourly_only(pyramids, start, end, resolution):
+    full, hourly = pyramids
+    routed = full.query('SPY', start, end, resolution)
+    assert full.last_route['level'] != 'H'
+    expected = hourly.query('SPY', start, end, resolution)
+    assert hourly.last_route['level'] == 'H'
+
+    pd.testing.assert_frame_equal(routed, expected, check_dtype=False, check_names=False)
+    assert routed.index[0] <= pd.Timestamp(start)
+    assert routed.index[-1] <= pd.Timestamp(end)
@@ -0,0 +1,22 @@
+"""
+DuckDB view tests over a temporary artifact store.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from marketdata.artifacts import save_artifact  # noqa: E402
+from marketdata.sql import connect  # noqa: E402
+
+
+def test_relative_artifact_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_artifact(pd.DataFrame({'compound': [0.1, 0.3]}), 'QQQ_gdelt_news', store_dir='art',
+                  verbose=False)
+
+    con = connect(artifact_dir='art', catalog_path='catalog.json', verbose=False)
+
+    assert con.execute('SELECT sum(compound) FROM qqq_gdelt_news').fetchone()[0] == 0.4